@@ -1,135 +1,39 @@
-import os
 import streamlit as st
-import requests
 from dotenv import load_dotenv
 import pandas as pd
 import time
-from urllib.parse import urlencode
+from config import APOLLO_SEARCH_CONCURRENCY, HUBSPOT_API_KEY, OPENAI_API_KEY
+from enrichment.apollo_enrich import enrich_contact_email, enrich_contacts_bulk
+from enrichment.person_store import PersonStore
+from enrichment.relevance_scoring import criteria_hash, score_people
+from enrichment.result_views import SELECTED_COLUMNS, ResultsView, SelectionView, get_page
+from enrichment.search_run import start_search_run
+from enrichment.selection import ContactSelection, NO_EMAIL
+from output.export_excel import EXPORT_FORMATS, build_export
+from output.export_hubspot import push_contacts
+from utils.debug_panel import debug_enabled, render_debug_panel
+from utils.jobs import CANCELLED, get_job_manager
+from utils.rate_limiter import QuotaExhausted
+from utils.tracing import get_tracer
 
 load_dotenv()
+# Whole-script timing for the debug panel (?debug=1)
+rerun_span = get_tracer().start("app.rerun", root=True)
+# A reopened tab finds its search again through the job id kept in the URL
+if "search_run" not in st.session_state:
+    job = get_job_manager().get(st.query_params.get("job"))
+    if job is not None and job.kind == "search":
+        st.session_state["search_run"] = job
+        st.session_state["results"] = job.results
 if "results" not in st.session_state:
-    st.session_state["results"] = []
+    st.session_state["results"] = PersonStore()
 if "selected_contacts" not in st.session_state:
-    st.session_state["selected_contacts"] = []
-
-
-def enrich_contact_email(person_id):
-    """Enrich contact with email using Apollo API"""
-    if not person_id:
-        return None
-        
-    url = f"https://api.apollo.io/api/v1/people/match?id={person_id}"
-    headers = {
-        "accept": "application/json",
-        "Cache-Control": "no-cache",
-        "Content-Type": "application/json",
-        "x-api-key": os.getenv("APOLLO_API_KEY")
-    }
-    
-    try:
-        print(f"🔍 Enriching contact ID: {person_id}")
-        response = requests.post(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        
-        email = data.get("person", {}).get("email")
-        print(f"📧 Email found: {email if email else 'No email available'}")
-        return email
-        
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to enrich contact {person_id}: {e}")
-        return None
-    except Exception as e:
-        print(f"❌ Error processing enrichment response for {person_id}: {e}")
-        return None
-
-
-def search_people(company_name, locations, job_titles=None, seniorities=None, domains=None, per_page=50, page=1):
-    # Build query parameters for Apollo API
-    params = []
-    if job_titles:  # Only add job titles if provided
-        for title in job_titles:
-            params.append(("person_titles[]", title))
-        params.append(("include_similar_titles", "true"))
-    for loc in locations:
-        params.append(("person_locations[]", loc))
-    if seniorities:
-        for s in seniorities:
-            params.append(("person_seniorities[]", s))
-    if domains:
-        for d in domains:
-            params.append(("q_organization_domains_list[]", d))
-    if company_name:  # Only add company name if it's not empty
-        params.append(("q_organization_names[]", company_name))
-    params.append(("contact_email_status[]", "verified"))
-    params.append(("per_page", str(per_page)))
-    params.append(("page", str(page)))
-    search_type = "DOMAIN" if domains else "COMPANY"
-    search_value = domains[0] if domains else company_name
-    print(f"\n🔍 === SEARCHING FOR {search_type}: {search_value} ===")
-    print(f"📍 Job titles: {job_titles if job_titles else 'Any position'}")
-    print(f"🌍 Locations: {locations}")
-    print(f"👥 Seniorities: {seniorities if seniorities else 'Any level'}")
-    if domains:
-        print(f"🌐 Domains: {domains}")
-    
-    # Show the exact parameters being sent
-    print(f"📋 URL Parameters:")
-    for param_name, param_value in params:
-        print(f"   {param_name}: {param_value}")
-    
-    url = f"https://api.apollo.io/api/v1/mixed_people/search?{urlencode(params)}"
-    headers = {
-        "accept": "application/json",
-        "Cache-Control": "no-cache",
-        "Content-Type": "application/json",
-        "x-api-key": os.getenv("APOLLO_API_KEY")
-    }
-    
-    try:
-        
-        api_key = os.getenv('APOLLO_API_KEY')
-        print(f"🔑 API Key present: {'Yes' if api_key else 'No'}")
-        print(f"🔑 API Key (first 10 chars): {api_key[:10] + '...' if api_key else 'None'}")
-        print(f"🌐 Request URL: {url}")
-        
-        resp = requests.post(url, headers=headers)
-        print(f"📊 HTTP Status: {resp.status_code}")
-        
-        resp.raise_for_status()
-        data = resp.json()
-        
-        # Print specific info about people returned
-        people = data.get("people", [])
-        total_results = data.get("total_results", 0)
-        
-        print(f"👥 People in response: {len(people)}")
-        print(f"📈 Total results available: {total_results}")
-        
-        # Log the first person's complete details for debugging
-        if people:
-            first_person = people[0]
-            print(f"🔍 First person returned:")
-            print(f"   ID: {first_person.get('id', 'N/A')}")
-            print(f"   Name: {first_person.get('name', 'N/A')}")
-            print(f"   Company: {first_person.get('organization_name', 'N/A')}")
-            print(f"   Title: {first_person.get('title', 'N/A')}")
-            print(f"   Location: {first_person.get('present_raw_address', 'N/A')}")
-            print(f"\n📋 COMPLETE FIRST PERSON DATA:")
-            print(f"{first_person}")
-            print("=" * 80)
-        
-        return people
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request failed for {company_name}: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"📊 Error status: {e.response.status_code}")
-            print(f"📋 Error response: {e.response.text}")
-        return []
-    except Exception as e:
-        print(f"❌ Error processing response for {company_name}: {e}")
-        return []
-
+    st.session_state["selected_contacts"] = ContactSelection()
+# Cached views: rebuilt only when results, selections or sort order change
+if "results_view" not in st.session_state:
+    st.session_state["results_view"] = ResultsView()
+if "selection_view" not in st.session_state:
+    st.session_state["selection_view"] = SelectionView()
 
 
 # — Interface Streamlit —
@@ -164,7 +68,9 @@ with col2:
 all_comps = list({n for n in all_comps if n})
 if not all_comps:
     st.warning("Please upload an Excel file with company domains or enter them manually.")
-    st.stop()
+    # Keep showing a search this session is attached to (e.g. after reopening the tab)
+    if st.session_state.get("search_run") is None:
+        st.stop()
 
 all_comps = [{"id": i, "name": n, "type": "domains"} for i, n in enumerate(all_comps)]
 
@@ -199,6 +105,36 @@ seniorities = st.multiselect(
 job_titles_input = st.text_input(
     "Job title (optional, up to 5), separated by ; (e.g. HR Director; Recruiter)"
 )
+search_concurrency = st.number_input(
+    "Parallel searches",
+    min_value=1,
+    max_value=50,
+    value=APOLLO_SEARCH_CONCURRENCY,
+    step=1,
+    help="Number of domains searched at the same time"
+)
+col1, col2 = st.columns(2)
+with col1:
+    max_per_domain = st.number_input(
+        "Max contacts per domain (0 = all)",
+        min_value=0,
+        value=100,
+        step=50,
+        help="Result pages are fetched until this many contacts were found for a domain"
+    )
+with col2:
+    max_total = st.number_input(
+        "Max contacts in total (0 = no limit)",
+        min_value=0,
+        value=0,
+        step=100,
+        help="The search stops as soon as this many contacts were found"
+    )
+use_search_cache = st.checkbox(
+    "Reuse cached search results",
+    value=True,
+    help="Identical searches run in the last hours are answered locally without API calls"
+)
 
 if st.button("Start Search"):
     job_titles = [j.strip() for j in job_titles_input.split(";") if j.strip()]
@@ -207,222 +143,326 @@ if st.button("Start Search"):
     if not selected or not locations:
         st.error("Please select at least:\n• 1 domain\n• 1 location")
     else:
-        try:
-            # Clear all previous results and cache
-            st.session_state["results"] = []  # Reset stored results
-            if "search_cache" in st.session_state:
-                del st.session_state["search_cache"]
-            
-            total_found = 0
-            progress = st.progress(0, text="Searching contacts...")
-            
-            for idx, item in enumerate(selected):
-                # st.write(f"🔍 **Now searching domain: {item}**")
-                # For domains, we search without specific company name
-                people = search_people(
-                    company_name="",  # Empty company name when using domains
-                    locations=locations,
-                    job_titles=job_titles,
-                    seniorities=seniorities,
-                    domains=[item]
-                )
-                search_label = item  # Use domain as the label
-                
-                try:
-                    company_results = 0
-                    people_from_api = len(people)  # Store original count
-                    
-                    for p in people:
-                        # Add the searched item (company or domain) to each person's data
-                        p["searched_company"] = search_label
-                        st.session_state["results"].append(p)
-                        company_results += 1
-                        total_found += 1
-                    
-                    # Debug info
-                    if company_results > 0:
-                        st.write(f"✅ {search_label}: Found {company_results} people")
-                    else:
-                        st.write(f"❌ {search_label}: No people found")
-                        
-                        # Additional debugging for failed searches
-                        st.write(f"   🔍 API returned {people_from_api} people for {search_label}")
-                        search_terms = []
-                        if job_titles:
-                            search_terms.append(f"titles: {', '.join(job_titles)}")
-                        search_terms.append(f"locations: {', '.join(locations)}")
-                        search_terms.append(f"domain: {item}")
-                        st.write(f"   📍 Search terms: {' | '.join(search_terms)}")
-                        if seniorities:
-                            st.write(f"   👥 Seniorities: {', '.join(seniorities)}")
-                        
-                except Exception as e:
-                    st.warning(f"Error searching {search_label}: {e}")
-                progress.progress((idx + 1) / len(selected), text=f"Searched {idx + 1}/{len(selected)} domains")
-                time.sleep(0.2)  # Small delay to avoid rate limits
-            
-            progress.empty()
-            st.success(f"Total people found: {total_found}")
-        except Exception as e:
-            st.error(f"Error during search: {e}")
+        # The search runs in the background; results stream into the grid below
+        previous_run = st.session_state.get("search_run")
+        if previous_run is not None:
+            previous_run.cancel()
+        search_run = start_search_run(
+            selected,
+            locations=locations,
+            job_titles=job_titles,
+            seniorities=seniorities,
+            concurrency=search_concurrency,
+            use_cache=use_search_cache,
+            max_per_domain=max_per_domain or None,
+            max_total=max_total or None
+        )
+        st.session_state["search_run"] = search_run
+        st.query_params["job"] = search_run.id
+        st.session_state["results"] = search_run.results  # Filled in as domains finish
+        st.session_state.current_page = 1
+
+def make_contact(row, email):
+    """Builds the selected-contact record for a result row (a PersonRecord)"""
+    return {
+        "ID": row.id,  # Apollo API ID for enrichment
+        "Name": row.name,
+        "Title": row.title,
+        "Company": row.company,
+        "Location": row.location,
+        "LinkedIn": row.linkedin,
+        "Email": email if email else NO_EMAIL
+    }
+
+def set_page(page):
+    """Moves the pager; the page number inputs are re-created so they show the new page."""
+    st.session_state.current_page = page
+    for key in ("page_top", "page_bottom"):
+        st.session_state.pop(key, None)
+
+def reset_page():
+    set_page(1)
 
 # Step 3 – Results and Export
-if st.session_state.get("results"):
+search_run = st.session_state.get("search_run")
+search_running = search_run is not None and search_run.running
+
+# While a search is running this section refreshes itself every second, so
+# results appear as domains finish and can already be selected and enriched
+@st.fragment(run_every=1.0 if search_running else None)
+def search_results_section():
+    run = st.session_state.get("search_run")
+    if run is None and not st.session_state.get("results"):
+        return
     st.subheader("3️⃣ Search Results")
 
-# Pagination for results
-def get_page(items, page, page_size):
-    start = page * page_size
-    end = start + page_size
-    return items[start:end]
-
-if st.session_state.get("results"):
-    data = st.session_state["results"]
-    rows = []
-    for p in data:
-        rows.append({
-            "Name": p.get("name"),
-            "Title": p.get("title"),
-            "Company": p.get("searched_company"),  # Use the company that was searched for
-            "Location": p.get("present_raw_address") or f"{p.get('city')}, {p.get('country')}",
-            "LinkedIn": p.get("linkedin_url"),
-            "ID": p.get("id")  # Keep Apollo API ID for enrichment
-        })
+    if run is not None:
+        if run.running:
+            st.progress(
+                run.done_count / max(1, len(run.domains)),
+                text=f"Searched {run.done_count}/{len(run.domains)} domains – {run.total_found} people so far"
+            )
+            if st.button("⏹️ Stop search"):
+                run.cancel()
+                st.rerun()
+        elif search_running:
+            # Finished since the last full run: refresh the whole page once to stop polling
+            st.rerun()
+        elif run.error:
+            st.error(f"Error during search: {run.error}")
+        elif run.status == CANCELLED:
+            st.info(f"Search stopped after {run.done_count}/{len(run.domains)} domains – {run.total_found} people found")
+        elif run.failed:
+            st.warning(f"Total people found: {run.total_found} – {len(run.failed)} domains could not be searched in full (see Search details)")
+        else:
+            st.success(f"Total people found: {run.total_found}")
+
+        with st.expander("Search details"):
+            for domain, count in list(run.domain_counts.items()):
+                if domain in run.failed:
+                    st.write(f"⚠️ {domain}: Search failed ({run.failed[domain]}) – {count} people found before it")
+                elif count > 0:
+                    st.write(f"✅ {domain}: Found {count} people")
+                else:
+                    st.write(f"❌ {domain}: No people found")
+                    search_terms = []
+                    if run.job_titles:
+                        search_terms.append(f"titles: {', '.join(run.job_titles)}")
+                    search_terms.append(f"locations: {', '.join(run.locations)}")
+                    search_terms.append(f"domain: {domain}")
+                    st.write(f"   📍 Search terms: {' | '.join(search_terms)}")
+                    if run.seniorities:
+                        st.write(f"   👥 Seniorities: {', '.join(run.seniorities)}")
+
+    if not st.session_state.get("results"):
+        return
+
+    # Relevance scores against the searched titles/seniorities (LLM, cached per person)
+    criteria = criteria_hash(run.job_titles, run.seniorities) if run is not None else None
+    relevance = st.session_state.get("relevance")
+    scores = relevance["scores"] if relevance and relevance["criteria"] == criteria else None
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        sort_options = ["Search order", "Name", "Title", "Company", "Location"] + (["Relevance"] if scores else [])
+        sort_by = st.selectbox("Sort by", sort_options, key="results_sort")
+    with col2:
+        min_score = st.slider("Minimum relevance", 0, 100, 0, 5, key="min_relevance", disabled=not scores,
+                              on_change=reset_page)
+    with col3:
+        if st.button("🎯 Score relevance", disabled=run is None or not OPENAI_API_KEY,
+                     help="Scores each person's fit with the searched titles and seniorities, to sort or prune before enriching"):
+            with st.spinner("Scoring people against the search criteria..."):
+                scores = score_people(st.session_state["results"].records(), run.job_titles, run.seniorities)
+            st.session_state["relevance"] = {"criteria": criteria, "scores": scores}
+            st.rerun()
+
+    # Results are compact PersonRecords; the sorted list is cached between reruns
+    rows = st.session_state["results_view"].rows(
+        st.session_state["results"],
+        sort_by=None if sort_by == "Search order" else sort_by,
+        scores=scores,
+        min_score=min_score if scores else 0
+    )
+    if not rows:
+        if scores and min_score:
+            st.info("No contacts above this relevance threshold – lower the minimum relevance to see them.")
+        return
+
     # Pagination controls
     page_size = 10
-    total_pages = (len(rows) - 1) // page_size + 1
-    
+    total_pages = max(1, (len(rows) - 1) // page_size + 1)
+
     # Initialize page in session state if not exists
     if "current_page" not in st.session_state:
         st.session_state.current_page = 1
-    
+
     # Ensure current page is within valid range
     if st.session_state.current_page > total_pages:
-        st.session_state.current_page = 1
-    
+        set_page(1)
+
     # Top pagination control
     col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
     with col1:
         if st.button("⬅️ Previous", key="prev_top", disabled=st.session_state.current_page <= 1):
-            st.session_state.current_page -= 1
+            set_page(st.session_state.current_page - 1)
             st.rerun()
     with col3:
         top_page = st.number_input("Page", min_value=1, max_value=total_pages, value=st.session_state.current_page, step=1, key="page_top")
         if top_page != st.session_state.current_page:
-            st.session_state.current_page = top_page
+            set_page(top_page)
             st.rerun()
     with col5:
         if st.button("Next ➡️", key="next_top", disabled=st.session_state.current_page >= total_pages):
-            st.session_state.current_page += 1
+            set_page(st.session_state.current_page + 1)
             st.rerun()
-    
+
     page = st.session_state.current_page - 1  # Convert to 0-based for indexing
     paged_rows = get_page(rows, page, page_size)
-    
+
     # Show results count
     start_idx = page * page_size + 1
     end_idx = min((page + 1) * page_size, len(rows))
     st.write(f"Showing {start_idx}-{end_idx} of {len(rows)} results")
-    for i, row in enumerate(paged_rows):
+
+    # Bulk selection: enrich every contact on the current page not yet selected, or drop the page.
+    # Buttons are keyed by the people shown: while a search streams in, rows can
+    # move between reruns, and a click must not apply to whoever took their place.
+    selection = st.session_state["selected_contacts"]
+    to_enrich = [r for r in paged_rows if r.id not in selection]
+    shown_ids = ",".join(r.id for r in paged_rows)
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("📨 Enrich all on this page", key=f"enrich_page_{shown_ids}", disabled=not to_enrich):
+            try:
+                with st.spinner(f"Enriching {len(to_enrich)} contacts..."):
+                    emails = enrich_contacts_bulk([r.id for r in to_enrich])
+            except QuotaExhausted as e:
+                st.error(f"⏳ {e}")
+            else:
+                selection.add_many(make_contact(r, emails.get(r.id)) for r in to_enrich)
+                st.rerun()
+    with col2:
+        if st.button("➖ Deselect all on this page", key=f"deselect_page_{shown_ids}",
+                     disabled=len(to_enrich) == len(paged_rows)):
+            selection.remove_many(r.id for r in paged_rows)
+            st.rerun()
+
+    for row in paged_rows:
         col1, col2 = st.columns([5, 1])
         with col1:
-            linkedin_display = f"👤 [LinkedIn]({row['LinkedIn']})" if row['LinkedIn'] else "👤 No LinkedIn profile"
-            st.markdown(f"**{row['Name']}** – {row['Title']}  \n"
-                        f"🏢 {row['Company']}  \n"
-                        f"📍 {row['Location']}  \n"
-                        f"{linkedin_display}")
+            linkedin_display = f"👤 [LinkedIn]({row.linkedin})" if row.linkedin else "👤 No LinkedIn profile"
+            relevance_display = f"  \n🎯 Relevance: {scores[row.id]}/100" if scores and row.id in scores else ""
+            st.markdown(f"**{row.name}** – {row.title}  \n"
+                        f"🏢 {row.company}  \n"
+                        f"📍 {row.location}  \n"
+                        f"{linkedin_display}{relevance_display}")
         with col2:
-            # Check if this contact is already selected
-            contact_id = f"{row['Name']}_{row['Company']}_{row['Title']}"
-            is_selected = any(c.get('contact_id') == contact_id for c in st.session_state["selected_contacts"])
-            
-            if is_selected:
-                if st.button("✅ Selected", key=f"selected_{page}_{i}", disabled=True):
+            # Check if this contact is already selected (by Apollo id)
+            if row.id in selection:
+                if st.button("✅ Selected", key=f"selected_{row.id}", disabled=True):
                     pass
             else:
-                if st.button("Select and enrich", key=f"select_{page}_{i}"):
-                    # Show enrichment progress
-                    with st.spinner(f"Enriching {row['Name']}..."):
-                        # Enrich contact with email
-                        email = enrich_contact_email(row["ID"])
-                    
-                    # Add contact to selected list
-                    contact_data = {
-                        "contact_id": contact_id,
-                        "ID": row["ID"],  # Apollo API ID for enrichment
-                        "Name": row["Name"],
-                        "Title": row["Title"], 
-                        "Company": row["Company"],
-                        "Location": row["Location"],
-                        "LinkedIn": row["LinkedIn"],
-                        "Email": email if email else "Not available"
-                    }
-                    st.session_state["selected_contacts"].append(contact_data)
-                    
-                    if email:
-                        st.success(f"{row['Name']} selected! Email: {email}")
+                if st.button("Select and enrich", key=f"select_{row.id}"):
+                    try:
+                        # Show enrichment progress
+                        with st.spinner(f"Enriching {row.name}..."):
+                            # Enrich contact with email
+                            email = enrich_contact_email(row.id)
+                    except QuotaExhausted as e:
+                        st.error(f"⏳ {e}")
                     else:
-                        st.success(f"{row['Name']} selected! (No email found)")
-                    st.rerun()
-    
+                        # Add contact to selected list
+                        selection.add(make_contact(row, email))
+
+                        if email:
+                            st.success(f"{row.name} selected! Email: {email}")
+                        else:
+                            st.success(f"{row.name} selected! (No email found)")
+                        st.rerun()
+
     # Bottom pagination control
     st.divider()
     col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
     with col1:
         if st.button("⬅️ Previous", key="prev_bottom", disabled=st.session_state.current_page <= 1):
-            st.session_state.current_page -= 1
+            set_page(st.session_state.current_page - 1)
             st.rerun()
     with col3:
         bottom_page = st.number_input("Page", min_value=1, max_value=total_pages, value=st.session_state.current_page, step=1, key="page_bottom")
         if bottom_page != st.session_state.current_page:
-            st.session_state.current_page = bottom_page
+            set_page(bottom_page)
             st.rerun()
     with col5:
         if st.button("Next ➡️", key="next_bottom", disabled=st.session_state.current_page >= total_pages):
-            st.session_state.current_page += 1
+            set_page(st.session_state.current_page + 1)
             st.rerun()
-    
+
     # Show pagination info at bottom too
     st.write(f"Showing {start_idx}-{end_idx} of {len(rows)} results")
 
+
+search_results_section()
+
 # Step 4 - Selected Contacts & Export
 if st.session_state.get("selected_contacts"):
     st.subheader("4️⃣ Selected Contacts")
     
-    # Show count and clear button
-    col1, col2 = st.columns([3, 1])
+    # Show count, bulk enrichment and clear buttons
+    selection = st.session_state["selected_contacts"]
+    missing_email = selection.missing_email()
+    col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
         st.write(f"📋 **{len(st.session_state['selected_contacts'])} contacts selected**")
     with col2:
+        if st.button("📨 Enrich all selected", disabled=not missing_email,
+                     help="Looks up emails for selected contacts that don't have one yet"):
+            try:
+                with st.spinner(f"Enriching {len(missing_email)} contacts..."):
+                    emails = enrich_contacts_bulk([c["ID"] for c in missing_email])
+            except QuotaExhausted as e:
+                st.error(f"⏳ {e}")
+            else:
+                for c in missing_email:
+                    selection.set_email(c["ID"], emails.get(c["ID"]))
+                st.rerun()
+    with col3:
         if st.button("Clear All", type="secondary"):
-            st.session_state["selected_contacts"] = []
+            selection.clear()
             st.success("All selections cleared!")
             st.rerun()
     
     # Display selected contacts in a more compact format
-    selected_df = pd.DataFrame(st.session_state["selected_contacts"])
-    
-    # Remove the contact_id column for display and reorder columns
-    column_order = ['Name', 'Title', 'Company', 'Location', 'Email', 'LinkedIn', 'ID']
-    display_df = selected_df[column_order]
+    display_df = st.session_state["selection_view"].frame(selection)
     
     # Show the dataframe
     st.dataframe(display_df, use_container_width=True)
     
-    # Download button
-    if len(st.session_state["selected_contacts"]) > 0:
-        # Prepare Excel file
-        excel_buffer = pd.io.common.BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            display_df.to_excel(writer, sheet_name='Selected Contacts', index=False)
-        
-        excel_buffer.seek(0)
-        
-        st.download_button(
-            label="📥 Download Selected Contacts (Excel)",
-            data=excel_buffer.getvalue(),
-            file_name=f"selected_contacts_{time.strftime('%Y%m%d_%H%M%S')}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            type="primary"
+    # Export: the file is only built when asked for, then kept until the selection changes
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        export_format = st.selectbox(
+            "Export format",
+            list(EXPORT_FORMATS),
+            format_func=lambda f: EXPORT_FORMATS[f]["label"],
+            label_visibility="collapsed"
         )
-            
\ No newline at end of file
+    export = st.session_state.get("export")
+    export_ready = export is not None and export["version"] == selection.version and export["format"] == export_format
+    with col2:
+        if not export_ready:
+            if st.button(f"📦 Prepare {EXPORT_FORMATS[export_format]['label']} export"):
+                with st.spinner(f"Building export of {len(selection)} contacts..."):
+                    data = build_export(selection.contacts(), SELECTED_COLUMNS, export_format, sheet_name='Selected Contacts')
+                st.session_state["export"] = {
+                    "version": selection.version,
+                    "format": export_format,
+                    "data": data,
+                    "file_name": f"selected_contacts_{time.strftime('%Y%m%d_%H%M%S')}.{export_format}"
+                }
+                st.rerun()
+        else:
+            st.download_button(
+                label=f"📥 Download Selected Contacts ({EXPORT_FORMATS[export_format]['label']})",
+                data=export["data"],
+                file_name=export["file_name"],
+                mime=EXPORT_FORMATS[export_format]["mime"],
+                type="primary"
+            )
+    with col3:
+        if st.button("🚀 Push to HubSpot", disabled=not HUBSPOT_API_KEY,
+                     help="Creates or updates the selected contacts in HubSpot, 100 per request"):
+            with st.spinner(f"Pushing {len(selection)} contacts to HubSpot..."):
+                st.session_state["hubspot_report"] = push_contacts(selection.contacts())
+
+    report = st.session_state.get("hubspot_report")
+    if report:
+        if report["failed"]:
+            st.warning(f"HubSpot: {report['pushed']} contacts pushed, {len(report['failed'])} failed")
+            with st.expander("Failed contacts"):
+                st.dataframe(pd.DataFrame(report["failed"], columns=["Name", "ID", "error"]), use_container_width=True)
+        else:
+            st.success(f"HubSpot: {report['pushed']} contacts pushed")
+
+get_tracer().finish(rerun_span)
+if debug_enabled():
+    render_debug_panel("app.rerun")
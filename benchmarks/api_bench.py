@@ -0,0 +1,229 @@
+# benchmarks/api_bench.py
+"""
+Throughput benchmark of the API layer against local stand-in servers.
+
+Runs the real client code (Apollo search/enrichment, Coresignal search and
+collect, HubSpot batch push) at several input sizes and reports requests/sec,
+p50/p95 latency per request and wall-clock time. No network access or API
+keys are needed:
+
+    python -m benchmarks.api_bench --sizes 10,100,1000 --latency 0.02 --error-rate 0.01
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.mock_servers import BASE_URL_ENV, MockBehavior, start_mock_servers
+
+SCENARIOS = ["apollo_search", "apollo_match", "apollo_enrich", "coresignal", "hubspot"]
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+# Client-side limit used unless --provider-limits is given: the point is to
+# measure the clients, not to wait on the production request budgets
+UNLIMITED_PER_MINUTE = 10_000_000
+
+
+def configure_environment(servers: dict, cache_dir: str):
+    """
+    Points every client at the stand-ins. Must run before config (and so any
+    client module) is imported, since base URLs are read at import time.
+    """
+    for provider, server in servers.items():
+        os.environ[BASE_URL_ENV[provider]] = server.base_url
+    for key in ("APOLLO_API_KEY", "CORESIGNAL_API_KEY", "HUBSPOT_API_KEY"):
+        os.environ[key] = "benchmark"
+    os.environ["CACHE_DIR"] = cache_dir
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Cached resources warn about the missing Streamlit runtime outside `streamlit run`
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+
+class LatencyRecorder:
+    """Exact per-attempt latencies, taken from the rate limiter's metrics hook."""
+
+    def __init__(self):
+        self.samples = []
+
+    def install(self):
+        from utils import rate_limiter
+
+        observe = rate_limiter._observe
+
+        def recording_observe(endpoint, started, status_code):
+            self.samples.append(time.perf_counter() - started)
+            observe(endpoint, started, status_code)
+
+        rate_limiter._observe = recording_observe
+        return self
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _domains(size: int) -> list[str]:
+    # Names are unique per size so caches and ledgers never answer for a previous run
+    return [f"company{i}.size{size}.example" for i in range(size)]
+
+
+def run_apollo_search(size, args, servers) -> int:
+    from enrichment.apollo_search import iter_search_domains
+
+    found = 0
+    for _, people, _ in iter_search_domains(_domains(size), ["France"], ["Head of Sales"], concurrency=args.concurrency, use_cache=False):
+        found += len(people)
+    return found
+
+
+def run_apollo_match(size, args, servers) -> int:
+    from enrichment.apollo_enrich import enrich_contact_email
+
+    ids = [f"{domain}-match" for domain in _domains(size)]
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        return sum(1 for email in pool.map(enrich_contact_email, ids) if email)
+
+
+def run_apollo_enrich(size, args, servers) -> int:
+    from enrichment.apollo_enrich import enrich_contacts_bulk
+
+    people = servers["apollo"].behavior.people_per_domain
+    ids = [f"{domain}-{i}" for domain in _domains(size) for i in range(people)]
+    return sum(1 for email in enrich_contacts_bulk(ids, args.concurrency).values() if email)
+
+
+def run_coresignal(size, args, servers) -> int:
+    from core.coresignal_client import search_companies
+    from core.coresignal_collect import collect_companies
+
+    servers["coresignal"].behavior.companies = size
+    ids = search_companies({"country": "France"}, max_results=size)
+    return len(collect_companies([str(cid) for cid in ids], args.concurrency, use_cache=False))
+
+
+def run_hubspot(size, args, servers) -> int:
+    from output.export_hubspot import push_contacts
+
+    people = servers["hubspot"].behavior.people_per_domain
+    contacts = [
+        {"ID": f"{domain}-{i}", "Name": f"Person {i}", "Title": "Head of Sales", "Company": domain,
+         "Location": "Paris", "LinkedIn": "", "Email": f"p{i}@{domain}"}
+        for domain in _domains(size) for i in range(people)
+    ]
+    return push_contacts(contacts, args.concurrency)["pushed"]
+
+
+RUNNERS = {
+    "apollo_search": run_apollo_search,
+    "apollo_match": run_apollo_match,
+    "apollo_enrich": run_apollo_enrich,
+    "coresignal": run_coresignal,
+    "hubspot": run_hubspot,
+}
+
+
+def run_benchmark(scenario, size, args, servers, recorder) -> dict:
+    from utils.logger import get_metrics
+    from utils.rate_limiter import get_rate_limiter
+
+    limiter = get_rate_limiter()
+    if not args.provider_limits:
+        limiter.limits_per_minute = {endpoint: UNLIMITED_PER_MINUTE for endpoint in limiter.limits_per_minute}
+    limiter.reset()
+    metrics = get_metrics()
+    metrics.reset()
+    recorder.samples = []
+
+    started = time.perf_counter()
+    items = RUNNERS[scenario](size, args, servers)
+    wall = time.perf_counter() - started
+
+    snapshot = metrics.snapshot()["counters"]
+    requests = sum(snapshot.get("api_calls_total", {}).values())
+    p50, p95 = recorder.percentile(0.5), recorder.percentile(0.95)
+    return {
+        "scenario": scenario,
+        "size": size,
+        "items": items,
+        "requests": requests,
+        "errors": sum(snapshot.get("api_errors_total", {}).values()),
+        "rate_limited": sum(snapshot.get("api_rate_limited_total", {}).values()),
+        "wall_s": round(wall, 3),
+        "req_per_s": round(requests / wall, 1) if wall else None,
+        "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+        "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+    }
+
+
+def print_table(results: list[dict]):
+    columns = ["scenario", "size", "items", "requests", "errors", "rate_limited", "wall_s", "req_per_s", "p50_ms", "p95_ms"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in columns}
+    print("  ".join(c.rjust(widths[c]) for c in columns))
+    for r in results:
+        print("  ".join(str(r[c]).rjust(widths[c]) for c in columns))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the API clients against local mock servers.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated numbers of domains")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated subset of {SCENARIOS}")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Mock server limit (requests/s) before answering 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--people-per-domain", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per scenario")
+    parser.add_argument("--provider-limits", action="store_true", help="Keep the production per-endpoint budgets")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+    args.sizes = [int(s) for s in args.sizes.split(",") if s]
+    args.scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(args.scenarios) - set(RUNNERS)
+    if unknown:
+        parser.error(f"unknown scenarios: {sorted(unknown)}")
+    return args
+
+
+def main(argv=None) -> list[dict]:
+    args = parse_args(argv)
+    behaviors = {
+        provider: MockBehavior(
+            latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+            rate_limit_per_second=args.rate_limit, retry_after=args.retry_after,
+            people_per_domain=args.people_per_domain, seed=args.seed
+        )
+        for provider in BASE_URL_ENV
+    }
+    servers = start_mock_servers(behaviors)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="api_bench_") as cache_dir:
+        configure_environment(servers, cache_dir)
+        recorder = LatencyRecorder().install()
+        try:
+            for scenario in args.scenarios:
+                for size in args.sizes:
+                    result = run_benchmark(scenario, size, args, servers, recorder)
+                    results.append(result)
+                    print(f"⏱️ {scenario} x{size}: {result['wall_s']}s, {result['req_per_s']} req/s, p95 {result['p95_ms']} ms",
+                          file=sys.stderr)
+        finally:
+            for server in servers.values():
+                server.stop()
+
+    print_table(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": {k: v for k, v in vars(args).items() if k != "output"}, "results": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+# benchmarks/micro_bench.py
+"""
+In-process micro-benchmarks of the pure-Python hot paths on synthetic
+Apollo-shaped person records (1k to 1M): projection into the PersonStore,
+sorted result rows and paging, selection lookups and table, exports, the
+filter option lookups and the query rule parser.
+
+    python -m benchmarks.micro_bench                   # compare with the stored baseline
+    python -m benchmarks.micro_bench --save-baseline   # record a new baseline
+
+Each case reports the median and fastest of --repeat runs. A case whose
+fastest run is slower than the baseline's by more than --threshold
+(default 25%) and by at least 2ms is flagged, and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "micro_bench.json")
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+DEFAULT_THRESHOLD = 0.25
+# Slowdowns smaller than this are scheduler noise, whatever the percentage
+NOISE_FLOOR_S = 0.002
+# Records are generated and ingested in search-page sized chunks, so the raw
+# payloads of 1M people never sit in memory at once (as in a real search)
+CHUNK_SIZE = 100
+PAGE_SIZE = 25
+
+FIRST_NAMES = ["Alice", "Bruno", "Chloé", "David", "Emma", "Farid", "Giulia", "Hugo", "Inès", "Jonas", "Karim", "Léa"]
+LAST_NAMES = ["Martin", "Bernard", "Dubois", "Smith", "García", "Rossi", "Müller", "Nguyen", "Kowalski", "Haddad"]
+TITLES = ["Head of Sales", "Sales Director", "VP Marketing", "Chief Revenue Officer", "Account Executive",
+          "Business Developer", "Head of Partnerships", "Growth Manager", "CEO", "Directeur Commercial"]
+SENIORITIES = ["c_suite", "vp", "head", "director", "manager", "senior", "entry"]
+CITIES = [("Paris", "France"), ("Lyon", "France"), ("London", "United Kingdom"), ("Berlin", "Germany"),
+          ("Madrid", "Spain"), ("Milan", "Italy"), ("Amsterdam", "Netherlands"), ("New York", "United States")]
+
+
+def apollo_person(rng: random.Random, index: int, domain: str) -> dict:
+    """One person shaped like a mixed_people/search result, nested blobs included."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    city, country = rng.choice(CITIES)
+    return {
+        "id": f"{index:024x}",
+        "first_name": first,
+        "last_name": last,
+        "name": f"{first} {last}",
+        "title": rng.choice(TITLES),
+        "seniority": rng.choice(SENIORITIES),
+        "linkedin_url": f"http://www.linkedin.com/in/{first.lower()}-{last.lower()}-{index}",
+        "city": city,
+        "state": None,
+        "country": country,
+        "present_raw_address": f"{city}, {country}" if rng.random() < 0.7 else None,
+        "email_status": "verified",
+        "photo_url": f"https://media.licdn.com/dms/image/{index:024x}/profile.jpg",
+        "headline": f"{rng.choice(TITLES)} at {domain}",
+        "organization": {
+            "id": f"org{hash(domain) & 0xffffffff:08x}",
+            "name": domain.split(".")[0].title(),
+            "primary_domain": domain,
+            "website_url": f"http://www.{domain}",
+            "estimated_num_employees": rng.randint(10, 50000),
+            "industry": "information technology & services",
+            "keywords": ["saas", "b2b", "sales", "crm", "software"],
+        },
+        "employment_history": [
+            {"organization_name": rng.choice(LAST_NAMES) + " SA", "title": rng.choice(TITLES),
+             "start_date": f"20{rng.randint(10, 23)}-01-01", "end_date": None, "current": j == 0}
+            for j in range(3)
+        ],
+    }
+
+
+def apollo_pages(size: int, seed: int = 0):
+    """Yields (domain, people) chunks totalling `size` synthetic people."""
+    rng = random.Random(seed)
+    for start in range(0, size, CHUNK_SIZE):
+        domain = f"company{start // CHUNK_SIZE}.example"
+        yield domain, [apollo_person(rng, i, domain) for i in range(start, min(size, start + CHUNK_SIZE))]
+
+
+def build_store(size: int):
+    from enrichment.person_store import PersonStore
+
+    store = PersonStore(keep_raw=False)
+    for domain, people in apollo_pages(size):
+        store.extend(people, searched_company=domain)
+    return store
+
+
+# Each case is (setup(size) -> state, run(state)), plus the largest size it is
+# worth running at (exports and the LLM-free parser are far slower per item)
+
+def _setup_ingest(size):
+    # Payloads are generated up front so only the projection is timed
+    return list(apollo_pages(size))
+
+
+def _run_ingest(pages):
+    from enrichment.person_store import PersonStore
+
+    store = PersonStore(keep_raw=False)
+    for domain, people in pages:
+        store.extend(people, searched_company=domain)
+
+
+def _setup_store(size):
+    return build_store(size)
+
+
+def _run_rows(store):
+    from enrichment.result_views import ResultsView
+
+    ResultsView().rows(store, sort_by="Name")
+
+
+def _setup_relevance(size):
+    store = build_store(size)
+    rng = random.Random(1)
+    scores = {r.id: rng.randint(0, 100) for r in store.records()}
+    return store, scores
+
+
+def _run_relevance(state):
+    from enrichment.result_views import ResultsView
+
+    store, scores = state
+    ResultsView().rows(store, sort_by="Relevance", scores=scores, min_score=50)
+
+
+def _setup_page(size):
+    from enrichment.result_views import ResultsView
+
+    store = build_store(size)
+    view = ResultsView()
+    view.rows(store, sort_by="Name")
+    return store, view
+
+
+def _run_page(state):
+    # A rerun that only changes page: every page of the cached rows in turn
+    store, view = state
+    pages = max(1, len(store) // PAGE_SIZE)
+    for page in range(0, pages, max(1, pages // 100)):
+        view.page(store, page, PAGE_SIZE, sort_by="Name")
+
+
+def _contact(record) -> dict:
+    from enrichment.selection import NO_EMAIL
+
+    row = record.as_row()
+    row["Email"] = NO_EMAIL
+    return row
+
+
+def _setup_selection(size):
+    from enrichment.selection import ContactSelection
+
+    store = build_store(size)
+    records = store.records()
+    selection = ContactSelection(_contact(r) for r in records[::10])
+    return records, selection
+
+
+def _run_selection_contains(state):
+    # The "already selected" check made for every displayed row
+    records, selection = state
+    for r in records:
+        r.id in selection
+
+
+def _run_selection_frame(state):
+    from enrichment.result_views import SelectionView
+
+    SelectionView().frame(state[1])
+
+
+def _setup_export(size):
+    from enrichment.result_views import SELECTED_COLUMNS
+
+    return [_contact(r) for r in build_store(size).records()], SELECTED_COLUMNS
+
+
+def _run_export_xlsx(state):
+    from output.export_excel import write_xlsx
+
+    write_xlsx(*state)
+
+
+def _run_export_csv(state):
+    from output.export_excel import write_csv
+
+    write_csv(*state)
+
+
+def _setup_option_lookups(size):
+    from core.filter_options import company_sizes, countries, industries
+
+    rng = random.Random(2)
+    options = {"size": ["None"] + company_sizes, "industry": ["None"] + industries, "country": ["None"] + countries}
+    picks = [(name, rng.choice(values)) for name, values in options.items() for _ in range(size // 3 or 1)]
+    return options, picks
+
+
+def _run_option_lookups(state):
+    # app_save.py turns each selectbox value back into its index on every rerun
+    options, picks = state
+    for name, value in picks:
+        options[name].index(value)
+
+
+def _setup_queries(size):
+    queries = [
+        "Find 50 tech companies in London with more than 1000 employees",
+        "banks in Germany with 500+ employees",
+        "100 software companies based in Paris",
+        "insurance companies in the uk between 51 and 200 employees",
+        "fintech startups in Berlin",
+    ]
+    return [queries[i % len(queries)] + " " * (i % 7) for i in range(size)]
+
+
+def _run_queries(queries):
+    from core.filters import parse_query_rules
+
+    for q in queries:
+        parse_query_rules(q)
+
+
+CASES = {
+    "person_store.extend": (_setup_ingest, _run_ingest, 100000),
+    "results.rows_sorted": (_setup_store, _run_rows, None),
+    "results.rows_relevance": (_setup_relevance, _run_relevance, None),
+    "results.get_page": (_setup_page, _run_page, None),
+    "selection.contains": (_setup_selection, _run_selection_contains, None),
+    "selection.frame": (_setup_selection, _run_selection_frame, None),
+    "export.xlsx": (_setup_export, _run_export_xlsx, 100000),
+    "export.csv": (_setup_export, _run_export_csv, 1000000),
+    "filter_options.index": (_setup_option_lookups, _run_option_lookups, None),
+    "filters.parse_query_rules": (_setup_queries, _run_queries, 10000),
+}
+
+
+def run_case(name: str, size: int, repeat: int) -> dict:
+    setup, run, _ = CASES[name]
+    state = setup(size)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - started)
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "repeat": repeat}
+
+
+def machine_info() -> dict:
+    return {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()}
+
+
+def load_baseline(path: str) -> dict | None:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Keys of the results slower than the baseline by more than `threshold`.
+    The fastest runs are compared: they are the least disturbed by the rest
+    of the machine.
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline["results"].get(key)
+        if not base:
+            continue
+        slower = result["min_s"] - base["min_s"]
+        if result["min_s"] > base["min_s"] * (1 + threshold) and slower >= NOISE_FLOOR_S:
+            regressions.append(key)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the in-process hot paths.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated numbers of records")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated subset of the cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    args = parser.parse_args(argv)
+    args.sizes = [int(s) for s in args.sizes.split(",") if s]
+    args.cases = [c for c in args.cases.split(",") if c]
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {sorted(unknown)}")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # Keep anything the code under test writes (raw payloads, caches) out of the project cache
+    os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="micro_bench_"))
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    if baseline and baseline.get("machine") != machine_info():
+        print(f"⚠️ Baseline was recorded on {baseline.get('machine')}; timings may not be comparable", file=sys.stderr)
+
+    results = {}
+    for name in args.cases:
+        max_size = CASES[name][2]
+        for size in args.sizes:
+            if max_size and size > max_size:
+                continue
+            key = f"{name}@{size}"
+            results[key] = run_case(name, size, args.repeat)
+            base = (baseline or {}).get("results", {}).get(key)
+            change = f" ({results[key]['min_s'] / base['min_s'] - 1:+.0%} vs baseline)" if base else ""
+            print(f"{key:<40} median {results[key]['median_s'] * 1000:>10.2f} ms  min {results[key]['min_s'] * 1000:>10.2f} ms{change}")
+
+    if args.save_baseline:
+        # Re-recording a subset of cases or sizes keeps the other entries
+        saved = load_baseline(args.baseline) or {}
+        merged = saved.get("results", {}) if saved.get("machine") == machine_info() else {}
+        merged.update(results)
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine_info(), "repeat": args.repeat, "results": merged}, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("ℹ️ No baseline to compare with; run with --save-baseline to record one")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for key in regressions:
+        print(f"❌ Regression: {key} {results[key]['min_s'] * 1000:.2f} ms vs "
+              f"{baseline['results'][key]['min_s'] * 1000:.2f} ms baseline")
+    if not regressions:
+        print(f"✅ No case slower than the baseline by more than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
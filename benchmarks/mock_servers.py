@@ -0,0 +1,242 @@
+# benchmarks/mock_servers.py
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Path prefixes of the real base URLs, so the clients' relative paths resolve the same way
+BASE_PATHS = {
+    "apollo": "/api/v1/",
+    "coresignal": "/cdapi/v2/",
+    "hubspot": "/",
+}
+# Environment variables read by config.py for each provider's base URL
+BASE_URL_ENV = {
+    "apollo": "APOLLO_BASE_URL",
+    "coresignal": "CORESIGNAL_BASE_URL",
+    "hubspot": "HUBSPOT_BASE_URL",
+}
+
+
+class MockBehavior:
+    """
+    How a stand-in server answers: a fixed latency plus random jitter, a share
+    of 500 errors, and an optional server-side rate limit answered with 429
+    and Retry-After once exceeded.
+    """
+
+    def __init__(self, latency=0.02, jitter=0.0, error_rate=0.0, rate_limit_per_second=None, retry_after=1.0,
+                 people_per_domain=5, companies=1000, company_page_size=1000, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_per_second = rate_limit_per_second
+        self.retry_after = retry_after
+        self.people_per_domain = people_per_domain
+        self.companies = companies
+        self.company_page_size = company_page_size
+        self.random = random.Random(seed)
+        self._tokens = float(rate_limit_per_second or 0)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def fails(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self.random.random() < self.error_rate
+
+    def rate_limited(self) -> bool:
+        """Token bucket holding one second of requests; True when the request must get a 429."""
+        if not self.rate_limit_per_second:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            rate = self.rate_limit_per_second
+            self._tokens = min(rate, self._tokens + (now - self._updated_at) * rate)
+            self._updated_at = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+            return False
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+    # Headers and body are separate writes: without this, Nagle + delayed ACK add ~40ms per response
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body, headers: dict | None = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self, method: str):
+        server = self.server
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"null") if length else None
+        route = url.path[len(server.base_path):] if url.path.startswith(server.base_path) else url.path.lstrip("/")
+
+        behavior = server.behavior
+        time.sleep(behavior.delay())
+        if behavior.rate_limited():
+            server.count(route, 429)
+            return self._send(429, {"error": "rate limited"}, {"Retry-After": behavior.retry_after})
+        if behavior.fails():
+            server.count(route, 500)
+            return self._send(500, {"error": "mock server error"})
+
+        answer = server.route(method, route, parse_qs(url.query), body)
+        if answer is None:
+            server.count(route, 404)
+            return self._send(404, {"error": f"no mock route for {method} {route}"})
+        status, payload, headers = answer
+        server.count(route, status)
+        self._send(status, payload, headers)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+class MockServer(ThreadingHTTPServer):
+    """A stand-in for one provider, serving on 127.0.0.1 in a daemon thread."""
+
+    daemon_threads = True
+    request_queue_size = 512
+
+    def __init__(self, provider: str, behavior: MockBehavior | None = None, port: int = 0):
+        super().__init__(("127.0.0.1", port), MockHandler)
+        self.provider = provider
+        self.behavior = behavior or MockBehavior()
+        self.base_path = BASE_PATHS[provider]
+        self.requests = Counter()  # (route, status) -> count
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{self.base_path}"
+
+    def count(self, route: str, status: int):
+        # Collect ids are part of the path; count them under one route
+        if route.startswith("company/base/collect/"):
+            route = "company/base/collect/{id}"
+        with self._count_lock:
+            self.requests[(route, status)] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name=f"mock-{self.provider}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def route(self, method: str, route: str, query: dict, body):
+        """Returns (status, payload, headers) for a known route, None otherwise."""
+        handler = ROUTES.get((self.provider, method, route))
+        if handler is None and method == "GET" and route.startswith("company/base/collect/"):
+            handler = _coresignal_collect
+        return handler(self, route, query, body) if handler else None
+
+
+def _apollo_person(person_id: str, domain: str) -> dict:
+    return {
+        "id": person_id,
+        "name": f"Person {person_id}",
+        "title": "Head of Sales",
+        "seniority": "head",
+        "linkedin_url": f"https://www.linkedin.com/in/{person_id}",
+        "city": "Paris",
+        "country": "France",
+        "organization": {"primary_domain": domain},
+    }
+
+
+def _apollo_search(server, route, query, body):
+    domain = (query.get("q_organization_domains_list[]") or query.get("q_organization_names[]") or ["example.com"])[0]
+    per_page = int((query.get("per_page") or ["50"])[0])
+    page = int((query.get("page") or ["1"])[0])
+    total = server.behavior.people_per_domain
+    start = (page - 1) * per_page
+    people = [_apollo_person(f"{domain}-{i}", domain) for i in range(start, min(total, start + per_page))]
+    return 200, {"people": people, "total_results": total}, {}
+
+
+def _apollo_match(server, route, query, body):
+    person_id = (query.get("id") or [""])[0]
+    return 200, {"person": {"id": person_id, "email": f"{person_id}@example.com"}}, {}
+
+
+def _apollo_bulk_match(server, route, query, body):
+    details = (body or {}).get("details") or []
+    matches = [{"id": d.get("id"), "email": f"{d.get('id')}@example.com"} for d in details]
+    return 200, {"matches": matches}, {}
+
+
+def _coresignal_search(server, route, query, body):
+    behavior = server.behavior
+    after = int((query.get("after") or ["0"])[0])
+    last = min(behavior.companies, after + behavior.company_page_size)
+    ids = list(range(after + 1, last + 1))
+    headers = {"x-next-page-after": last} if ids and last < behavior.companies else {}
+    return 200, ids, headers
+
+
+def _coresignal_collect(server, route, query, body):
+    company_id = route.rstrip("/").rsplit("/", 1)[-1]
+    return 200, {
+        "id": int(company_id) if company_id.isdigit() else company_id,
+        "name": f"Company {company_id}",
+        "size": "51-200 employees",
+        "industry": "Software Development",
+        "hq_country": "France",
+        "hq_location": "Paris, France",
+        "employees_count": 120,
+        "last_updated": "2024-01-01",
+    }, {}
+
+
+def _hubspot_batch(server, route, query, body):
+    inputs = (body or {}).get("inputs") or []
+    results = [{"id": str(i), "properties": item.get("properties", {})} for i, item in enumerate(inputs)]
+    return 200, {"status": "COMPLETE", "results": results, "errors": []}, {}
+
+
+ROUTES = {
+    ("apollo", "POST", "mixed_people/search"): _apollo_search,
+    ("apollo", "POST", "people/match"): _apollo_match,
+    ("apollo", "POST", "people/bulk_match"): _apollo_bulk_match,
+    ("coresignal", "POST", "company_base/search/filter"): _coresignal_search,
+    ("hubspot", "POST", "crm/v3/objects/contacts/batch/upsert"): _hubspot_batch,
+    ("hubspot", "POST", "crm/v3/objects/contacts/batch/create"): _hubspot_batch,
+}
+
+
+def start_mock_servers(behaviors: dict | None = None) -> dict:
+    """
+    Starts one stand-in per provider ({provider: MockBehavior} overrides the
+    default behavior). Returns {provider: MockServer}; point the clients at
+    them with `server.base_url` through the *_BASE_URL environment variables.
+    """
+    behaviors = behaviors or {}
+    return {provider: MockServer(provider, behaviors.get(provider)).start() for provider in BASE_PATHS}
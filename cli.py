@@ -0,0 +1,261 @@
+# cli.py
+"""
+Headless contact finder: the Streamlit app's search (and optional email
+enrichment) for a whole sheet of company domains, without a browser.
+
+    python cli.py domains.xlsx -o contacts.xlsx --locations "London; Paris" \\
+        --titles "Head of Sales; CEO" --seniorities head,director --enrich
+
+Rows are appended to the output as each domain finishes, and every finished
+domain is recorded in a checkpoint file next to the output. Running the same
+command again after a crash or Ctrl-C resumes at the next unfinished domain;
+domains whose search or email lookup failed are left out of the checkpoint,
+so that run retries them too.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from config import APOLLO_SEARCH_CONCURRENCY
+from enrichment.apollo_enrich import enrich_contacts_bulk
+from enrichment.apollo_search import iter_search_domains
+from enrichment.person_store import PersonRecord
+from enrichment.result_views import SELECTED_COLUMNS
+from enrichment.selection import NO_EMAIL
+from output.export_excel import write_xlsx
+from utils.logger import get_logger
+from utils.rate_limiter import QuotaExhausted
+
+log = get_logger("cli")
+
+# Same input sheet as the Streamlit app
+DOMAIN_COLUMN = "Company Domain Name"
+SENIORITIES = ["owner", "founder", "c_suite", "partner", "vp", "head", "director", "manager", "senior", "entry", "intern"]
+
+
+def split_list(value: str | None, sep: str = ";") -> list[str]:
+    return [v.strip() for v in (value or "").split(sep) if v.strip()]
+
+
+def load_domains(path: str) -> list[str]:
+    """Unique domains of the "Company Domain Name" column, in sheet order."""
+    df = pd.read_csv(path) if path.lower().endswith(".csv") else pd.read_excel(path)
+    if DOMAIN_COLUMN not in df.columns:
+        raise ValueError(f"{path} must contain a '{DOMAIN_COLUMN}' column (found: {', '.join(map(str, df.columns))})")
+    domains = (str(d).strip() for d in df[DOMAIN_COLUMN].dropna())
+    return list(dict.fromkeys(d for d in domains if d))
+
+
+class Checkpoint:
+    """
+    Append-only JSONL file: a header line with the search settings, then one
+    line per finished domain with the size of the rows file once that
+    domain's rows were flushed. On resume the rows file is cut back to the
+    last recorded size, so a domain interrupted halfway is written again
+    from scratch rather than twice.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.settings = None
+        self.done = {}  # domain -> people written
+        self.offset = 0
+
+    def load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # Torn last line from a crash
+                if "settings" in entry:
+                    self.settings = entry["settings"]
+                    self.offset = entry["offset"]
+                else:
+                    self.done[entry["domain"]] = entry["people"]
+                    self.offset = entry["offset"]
+        return self.settings is not None
+
+    def start(self, settings: dict, offset: int):
+        """`offset` is the size of the rows file holding just its header."""
+        self.settings = settings
+        self.done = {}
+        self.offset = offset
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"settings": settings, "offset": offset}) + "\n")
+
+    def record(self, domain: str, people: int, offset: int):
+        self.done[domain] = people
+        self.offset = offset
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"domain": domain, "people": people, "offset": offset}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def contact_row(person: dict, domain: str, email=None, enriched: bool = False) -> dict:
+    """Output row for an Apollo person, with the same columns as the app's selection export."""
+    record = PersonRecord.from_apollo(person, searched_company=domain)
+    row = record.as_row()
+    row["Email"] = (email or NO_EMAIL) if enriched else ""
+    return row
+
+
+def rows_path_for(output: str) -> str:
+    """CSV outputs are written in place; other formats are built from a CSV at the end."""
+    return output if output.lower().endswith(".csv") else output + ".partial.csv"
+
+
+def read_written_ids(rows_path: str) -> set:
+    if not os.path.exists(rows_path):
+        return set()
+    with open(rows_path, newline="", encoding="utf-8-sig") as f:
+        return {row["ID"] for row in csv.DictReader(f) if row.get("ID")}
+
+
+def run(args) -> int:
+    domains = load_domains(args.input)
+    settings = {
+        "input": os.path.abspath(args.input),
+        "locations": args.locations,
+        "titles": args.titles,
+        "seniorities": args.seniorities,
+        "enrich": args.enrich,
+        "max_per_domain": args.max_per_domain,
+    }
+    rows_path = rows_path_for(args.output)
+    checkpoint = Checkpoint(args.checkpoint or args.output + ".checkpoint")
+
+    resuming = not args.restart and checkpoint.load() and os.path.exists(rows_path)
+    if resuming and checkpoint.settings != settings:
+        log.error("❌ %s was written by a run with different settings; use --restart to start over", checkpoint.path)
+        return 2
+    if resuming:
+        if args.retry_empty:
+            checkpoint.done = {d: n for d, n in checkpoint.done.items() if n}
+        # Drop rows of a domain that was being written when the run stopped
+        with open(rows_path, "a+b") as f:
+            f.truncate(checkpoint.offset)
+        log.info("🔁 Resuming: %d/%d domains already done", len(checkpoint.done), len(domains))
+    else:
+        with open(rows_path, "w", newline="", encoding="utf-8-sig") as f:
+            csv.writer(f).writerow(SELECTED_COLUMNS)
+            f.flush()
+            checkpoint.start(settings, f.tell())
+
+    todo = [d for d in domains if d not in checkpoint.done]
+    written_ids = read_written_ids(rows_path) if resuming else set()
+    started = time.time()
+    found = 0
+    failed = []
+
+    try:
+        with open(rows_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=SELECTED_COLUMNS)
+            results = iter_search_domains(
+                todo,
+                args.locations,
+                args.titles,
+                args.seniorities,
+                concurrency=args.concurrency,
+                use_cache=not args.no_cache,
+                max_per_domain=args.max_per_domain
+            )
+            for domain, people, error in results:
+                # A person found under several domains is written once, like in the app's selection
+                people = [p for p in people if p.get("id") not in written_ids]
+                emails = {}
+                if args.enrich and people and not error:
+                    emails = enrich_contacts_bulk([p.get("id") for p in people], args.concurrency)
+                    unenriched = sum(1 for p in people if p.get("id") not in emails)
+                    if unenriched:
+                        error = f"email lookup failed for {unenriched} people"
+                if error:
+                    # Not checkpointed: the next run searches the domain again
+                    # (emails already paid for come back from the ledger)
+                    failed.append(domain)
+                    log.warning("⚠️ %s: %s; it will be retried on the next run", domain, error)
+                    continue
+                for person in people:
+                    writer.writerow(contact_row(person, domain, emails.get(person.get("id")), args.enrich))
+                    written_ids.add(person.get("id"))
+                f.flush()
+                os.fsync(f.fileno())
+                checkpoint.record(domain, len(people), f.tell())
+                found += len(people)
+                log.info("✅ [%d/%d] %s: %d people", len(checkpoint.done), len(domains), domain, len(people))
+    except KeyboardInterrupt:
+        log.warning("⏸️ Interrupted after %d/%d domains; run the same command again to resume", len(checkpoint.done), len(domains))
+        return 130
+    except QuotaExhausted as e:
+        log.error("❌ Stopped after %d/%d domains: %s; run the same command again after that to resume", len(checkpoint.done), len(domains), e)
+        return 1
+
+    log.info("🏁 %d domains searched, %d people written in %.1fs", len(todo), found, time.time() - started)
+    if failed:
+        log.error("❌ %d domains failed; run the same command again to retry them", len(failed))
+        return 1
+    if rows_path != args.output:
+        with open(rows_path, newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        with open(args.output, "wb") as f:
+            f.write(write_xlsx(rows, SELECTED_COLUMNS, sheet_name="Contacts"))
+        os.remove(rows_path)
+    os.remove(checkpoint.path)
+    log.info("💾 Results saved to %s", args.output)
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Find (and optionally enrich) contacts for a sheet of company domains.")
+    parser.add_argument("input", help=f"xlsx/xls/csv file with a '{DOMAIN_COLUMN}' column")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.xlsx or .csv)")
+    parser.add_argument("--locations", required=True, help="Locations separated by ; (e.g. 'London; Paris')")
+    parser.add_argument("--titles", default="", help="Job titles separated by ;")
+    parser.add_argument("--seniorities", default="", help=f"Comma-separated, among {', '.join(SENIORITIES)}")
+    parser.add_argument("--enrich", action="store_true", help="Look up each contact's email (uses Apollo credits)")
+    parser.add_argument("--max-per-domain", type=int, default=100, help="0 = all contacts")
+    parser.add_argument("--concurrency", type=int, default=APOLLO_SEARCH_CONCURRENCY, help="Domains searched at the same time")
+    parser.add_argument("--no-cache", action="store_true", help="Do not answer searches from the local cache")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    parser.add_argument("--retry-empty", action="store_true", help="When resuming, search again domains that found nobody")
+    args = parser.parse_args(argv)
+
+    args.locations = split_list(args.locations)
+    args.titles = split_list(args.titles)
+    args.seniorities = split_list(args.seniorities, ",")
+    args.max_per_domain = args.max_per_domain or None
+    if not args.locations:
+        parser.error("at least one location is required")
+    unknown = set(args.seniorities) - set(SENIORITIES)
+    if unknown:
+        parser.error(f"unknown seniorities: {', '.join(sorted(unknown))}")
+    if not args.output.lower().endswith((".xlsx", ".csv")):
+        parser.error("the output must be a .xlsx or .csv file")
+    return args
+
+
+def main(argv=None) -> int:
+    # Cached resources warn about the missing Streamlit runtime outside `streamlit run`
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    args = parse_args(argv)
+    try:
+        return run(args)
+    except (OSError, ValueError) as e:
+        log.error("❌ %s", e)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
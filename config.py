@@ -7,3 +7,55 @@ CORESIGNAL_API_KEY = os.getenv("CORESIGNAL_API_KEY")
 APOLLO_API_KEY = os.getenv("APOLLO_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 HUBSPOT_API_KEY = os.getenv("HUBSPOT_API_KEY")
+
+# Maximum number of Apollo searches in flight at once
+APOLLO_SEARCH_CONCURRENCY = int(os.getenv("APOLLO_SEARCH_CONCURRENCY", "8"))
+
+# Provider base URLs (overridable, e.g. to point at a local stand-in)
+APOLLO_BASE_URL = os.getenv("APOLLO_BASE_URL", "https://api.apollo.io/api/v1/")
+CORESIGNAL_BASE_URL = os.getenv("CORESIGNAL_BASE_URL", "https://api.coresignal.com/cdapi/v2/")
+HUBSPOT_BASE_URL = os.getenv("HUBSPOT_BASE_URL", "https://api.hubapi.com/")
+
+# Shared HTTP connection pools
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "50"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+# Local cache directory and Apollo search response cache
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(24 * 3600)))
+SEARCH_CACHE_MEMORY_ENTRIES = int(os.getenv("SEARCH_CACHE_MEMORY_ENTRIES", "2000"))
+# Cached pages hold up to 100 raw Apollo people each, so memory is capped in size too
+SEARCH_CACHE_MEMORY_MB = int(os.getenv("SEARCH_CACHE_MEMORY_MB", "64"))
+SEARCH_CACHE_MAX_MB = int(os.getenv("SEARCH_CACHE_MAX_MB", "200"))
+
+# Enrichment ledger: how long found emails and "no email" answers are trusted
+ENRICHMENT_TTL = float(os.getenv("ENRICHMENT_TTL", str(180 * 24 * 3600)))
+ENRICHMENT_NEGATIVE_TTL = float(os.getenv("ENRICHMENT_NEGATIVE_TTL", str(7 * 24 * 3600)))
+# Page size used when walking all pages of a search (Apollo's maximum is 100)
+APOLLO_SEARCH_PER_PAGE = int(os.getenv("APOLLO_SEARCH_PER_PAGE", "100"))
+
+# Keep the full Apollo person payloads on disk next to the compact results
+KEEP_RAW_PEOPLE = os.getenv("KEEP_RAW_PEOPLE", "false").lower() in ("1", "true", "yes")
+
+# Coresignal company profiles: served from cache while fresh, served and
+# refreshed in the background while stale, fetched again after that
+COMPANY_PROFILE_TTL = float(os.getenv("COMPANY_PROFILE_TTL", str(30 * 24 * 3600)))
+COMPANY_PROFILE_STALE_TTL = float(os.getenv("COMPANY_PROFILE_STALE_TTL", str(150 * 24 * 3600)))
+CORESIGNAL_COLLECT_CONCURRENCY = int(os.getenv("CORESIGNAL_COLLECT_CONCURRENCY", "8"))
+
+# How long LLM-parsed query filters are reused for the same (normalized) query
+QUERY_FILTERS_CACHE_TTL = float(os.getenv("QUERY_FILTERS_CACHE_TTL", str(30 * 24 * 3600)))
+
+# LLM relevance scores of people against the searched titles/seniorities
+RELEVANCE_SCORE_TTL = float(os.getenv("RELEVANCE_SCORE_TTL", str(30 * 24 * 3600)))
+RELEVANCE_BATCH_SIZE = int(os.getenv("RELEVANCE_BATCH_SIZE", "40"))
+
+# Logging: level, "text" or "json" lines, and the share of sampled (per-call) debug lines kept
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+
+# Background jobs (searches): worker threads, and how long finished jobs stay reachable by id
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_TTL = float(os.getenv("JOB_TTL", str(24 * 3600)))
+MAX_JOBS = int(os.getenv("MAX_JOBS", "100"))
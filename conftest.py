@@ -0,0 +1,15 @@
+# conftest.py
+
+import os
+import tempfile
+
+from benchmarks.mock_servers import BASE_URL_ENV, MockBehavior, start_mock_servers
+
+# Every client talks to local stand-ins, and caches live in a throwaway
+# directory. This must happen before config is imported by any test module.
+_servers = start_mock_servers({provider: MockBehavior(latency=0.005) for provider in BASE_URL_ENV})
+for _provider, _server in _servers.items():
+    os.environ[BASE_URL_ENV[_provider]] = _server.base_url
+for _key in ("APOLLO_API_KEY", "CORESIGNAL_API_KEY", "HUBSPOT_API_KEY"):
+    os.environ[_key] = "test"
+os.environ["CACHE_DIR"] = tempfile.mkdtemp(prefix="ai_agent_tests_")
@@ -0,0 +1,51 @@
+# core/company_profile_cache.py
+
+import os
+import time
+
+import streamlit as st
+
+from config import CACHE_DIR, COMPANY_PROFILE_TTL, COMPANY_PROFILE_STALE_TTL
+from utils.response_cache import ResponseCache
+
+# Collected profiles cost credits: never trim the cache for size
+PROFILE_CACHE_MAX_BYTES = 10 * 1024 * 1024 * 1024
+
+
+class CompanyProfileCache:
+    """
+    Persistent cache of Coresignal company profiles, keyed by company id.
+
+    A profile is fresh for `ttl` seconds, then stale for another `stale_ttl`
+    seconds: stale profiles are still served, and callers refresh them in
+    the background. After that the entry expires.
+    """
+
+    def __init__(self, path: str, ttl: float = COMPANY_PROFILE_TTL, stale_ttl: float = COMPANY_PROFILE_STALE_TTL):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._cache = ResponseCache(path, ttl=ttl + stale_ttl, max_memory_entries=5000, max_disk_bytes=PROFILE_CACHE_MAX_BYTES)
+
+    def lookup(self, company_id) -> tuple[dict | None, bool]:
+        """Returns (profile, is_stale); profile is None when nothing usable is cached."""
+        entry = self._cache.get(str(company_id))
+        if entry is None:
+            return None, False
+        return entry["profile"], time.time() - entry["fetched_at"] > self.ttl
+
+    def record(self, company_id, profile: dict):
+        self._cache.set(str(company_id), {"profile": profile, "fetched_at": time.time()})
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+
+@st.cache_resource
+def get_company_profile_cache() -> CompanyProfileCache:
+    """Profile cache shared by every session in the server process."""
+    return CompanyProfileCache(os.path.join(CACHE_DIR, "company_profiles.sqlite3"))
@@ -0,0 +1,148 @@
+# core/company_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+from config import CACHE_DIR
+
+# Filter fields answered from the local store, with the SQL used for each
+FILTER_CLAUSES = {
+    "size": "size = ?",
+    "industry": "industry = ?",
+    "country": "country = ?",
+    "location": "location LIKE ?",
+    "employees_count_gte": "employees_count >= ?",
+    "last_updated_gte": "last_updated >= ?",
+}
+
+
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    return value or None
+
+
+def profile_fields(profile: dict) -> dict:
+    """Indexed fields of a collected Coresignal profile, normalized for matching."""
+    employees = profile.get("employees_count")
+    try:
+        employees = int(employees) if employees is not None else None
+    except (TypeError, ValueError):
+        employees = None
+    return {
+        "size": _text(profile.get("size")),
+        "industry": _text(profile.get("industry")),
+        "country": _text(profile.get("hq_country") or profile.get("country")),
+        "location": _text(profile.get("hq_location") or profile.get("location")),
+        "employees_count": employees,
+        "last_updated": (str(profile.get("last_updated") or "")[:10]) or None,
+    }
+
+
+class CompanyStore:
+    """
+    SQLite table of every company profile we have collected, with indexes on
+    the fields app_save.py filters on, so searches over known companies are
+    answered locally instead of through the Coresignal API.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS companies (
+                id TEXT PRIMARY KEY,
+                size TEXT,
+                industry TEXT,
+                country TEXT,
+                location TEXT,
+                employees_count INTEGER,
+                last_updated TEXT,
+                profile TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            )"""
+        )
+        for column in ("size", "industry", "country", "location", "employees_count", "last_updated"):
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS companies_{column} ON companies ({column})")
+        self._db.commit()
+
+    def add(self, company_id, profile: dict):
+        self.add_many({company_id: profile})
+
+    def add_many(self, profiles: dict):
+        """Inserts or replaces {company_id: profile}."""
+        now = time.time()
+        rows = []
+        for company_id, profile in profiles.items():
+            fields = profile_fields(profile)
+            rows.append((
+                str(company_id), fields["size"], fields["industry"], fields["country"], fields["location"],
+                fields["employees_count"], fields["last_updated"], json.dumps(profile, ensure_ascii=False), now
+            ))
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO companies "
+                "(id, size, industry, country, location, employees_count, last_updated, profile, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._db.commit()
+
+    def get(self, company_id) -> dict | None:
+        with self._lock:
+            row = self._db.execute("SELECT profile FROM companies WHERE id = ?", (str(company_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(self, filters: dict, limit: int | None = None) -> tuple[list[str], bool]:
+        """
+        Ids of the stored companies matching the filters (same keys as the
+        app_save.py form). The flag says whether the API still needs to be
+        asked: the local store only knows the companies collected so far, so
+        it is only enough when it already holds `limit` matches.
+        """
+        clauses = []
+        args = []
+        for key, clause in FILTER_CLAUSES.items():
+            value = filters.get(key)
+            if value in (None, ""):
+                continue
+            if key == "employees_count_gte":
+                args.append(int(value))
+            elif key == "last_updated_gte":
+                args.append(str(value)[:10])
+            elif key == "location":
+                args.append(f"%{_text(value)}%")
+            else:
+                args.append(_text(value))
+            clauses.append(clause)
+
+        sql = "SELECT id FROM companies"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            ids = [row[0] for row in self._db.execute(sql, args)]
+        return ids, not limit or len(ids) < limit
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+
+@st.cache_resource
+def get_company_store() -> CompanyStore:
+    """Company store shared by every session in the server process."""
+    return CompanyStore(os.path.join(CACHE_DIR, "companies.sqlite3"))
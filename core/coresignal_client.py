@@ -1,20 +1,17 @@
 # core/coresignal_client.py
 
-import requests
-from config import CORESIGNAL_API_KEY
+from utils.http_client import get_clients
+from utils.logger import get_logger
+from utils.rate_limiter import get_rate_limiter
+from utils.tracing import span, traced
 
-BASE_URL = "https://api.coresignal.com/cdapi/v2/company_base/search/filter"
+log = get_logger(__name__)
 
-def search_companies(filters: dict) -> list[dict]:
-    """
-    Envoie dynamiquement les filtres fournis à l’API Coresignal et retourne les résultats.
-    """
+SEARCH_PATH = "company_base/search/filter"
+RATE_LIMIT_ENDPOINT = "coresignal.search"
 
-    headers = {
-        "accept": "application/json",
-        "apikey": CORESIGNAL_API_KEY,
-        "Content-Type": "application/json"
-    }
+def build_search_payload(filters: dict) -> dict:
+    """Construit le payload de recherche à partir des filtres fournis."""
 
     payload = {}
     # Mapping des clés en payload respectant les noms API
@@ -30,19 +27,85 @@ def search_companies(filters: dict) -> list[dict]:
     for key, field in mapping.items():
         if key in filters and filters[key]:
             payload[field] = filters[key]
+    return payload
+
 
+def flatten_ids(results) -> list:
+    """The filter search may return nested lists of ids; flatten them."""
+    flat_ids = []
+    for batch in results:
+        if isinstance(batch, list):
+            flat_ids.extend(batch)
+        else:
+            flat_ids.append(batch)
+    return flat_ids
 
-    response = requests.post(BASE_URL, headers=headers, json=payload)
 
-    print("🔎 Response status:", response.status_code)
-    if response.status_code != 200:
-        raise Exception(f"Coresignal API error {response.status_code}: {response.text}")
-    
-    data = response.json()
-    print("📦 Search results:", data)
+def _page_results(data) -> list:
     if isinstance(data, list):
         return data
     elif isinstance(data, dict) and "results" in data:
         return data["results"]
     else:
         raise ValueError("Unexpected API response format")
+
+
+def _header_int(headers, name) -> int | None:
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_company_ids(filters: dict, max_results: int | None = None):
+    """
+    Yields company ids page by page as Coresignal returns them.
+
+    Follows the `x-next-page-after` cursor when the API sends one, otherwise
+    walks `?page=N` up to `x-total-pages`. Stops on an empty page, and stops
+    fetching as soon as `max_results` ids have been yielded.
+    """
+    payload = build_search_payload(filters)
+    session = get_clients().session("coresignal")
+    params = {}
+    page = 1
+    seen = set()
+
+    while True:
+        with span("coresignal.search_companies_page", page=page):
+            response = get_rate_limiter().call(
+                RATE_LIMIT_ENDPOINT,
+                lambda: session.post(SEARCH_PATH, json=payload, params=params)
+            )
+
+        log.debug("🔎 Response status (page %d): %s", page, response.status_code)
+        if response.status_code != 200:
+            raise Exception(f"Coresignal API error {response.status_code}: {response.text}")
+
+        ids = [cid for cid in flatten_ids(_page_results(response.json())) if cid not in seen]
+        log.debug("📦 Page %d: %d companies", page, len(ids))
+        if not ids:
+            return
+        for cid in ids:
+            seen.add(cid)
+            yield cid
+            if max_results and len(seen) >= max_results:
+                return
+
+        next_after = response.headers.get("x-next-page-after")
+        total_pages = _header_int(response.headers, "x-total-pages")
+        page += 1
+        if next_after:
+            params = {"after": next_after}
+        elif total_pages and page <= total_pages:
+            params = {"page": page}
+        else:
+            return
+
+
+@traced("coresignal.search_companies")
+def search_companies(filters: dict, max_results: int | None = None) -> list:
+    """
+    Envoie dynamiquement les filtres fournis à l’API Coresignal et retourne les résultats.
+    """
+    return list(iter_company_ids(filters, max_results))
@@ -1,20 +1,132 @@
-import requests
-from config import CORESIGNAL_API_KEY
+import asyncio
+import threading
 
-BASE_URL = "https://api.coresignal.com/cdapi/v2/company/base/collect/"
+from config import CORESIGNAL_COLLECT_CONCURRENCY
+from core.company_profile_cache import CompanyProfileCache, get_company_profile_cache
+from core.company_store import CompanyStore, get_company_store
+from utils.http_client import get_clients
+from utils.logger import get_logger
+from utils.rate_limiter import QuotaExhausted, get_rate_limiter
+from utils.tracing import traced
 
-def collect_company(company_id: str) -> dict:
+log = get_logger(__name__)
+
+COLLECT_PATH = "company/base/collect/"
+RATE_LIMIT_ENDPOINT = "coresignal.collect"
+
+# Company ids whose stale profile is being refreshed in the background;
+# script threads and the client loop both update it
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+@traced("coresignal.collect_company")
+def collect_company(company_id: str, use_cache: bool = True) -> dict:
     """
     Retrieves full company data from Coresignal using the collect endpoint.
+    Cached profiles are returned straight away; stale ones are refreshed in
+    the background for the next caller.
     """
-    url = BASE_URL + company_id
-    headers = {
-        "accept": "application/json",
-        "apikey": CORESIGNAL_API_KEY
-    }
+    cache = get_company_profile_cache()
+    if use_cache:
+        profile, stale = cache.lookup(company_id)
+        if profile is not None:
+            if stale:
+                refresh_in_background([company_id], cache=cache)
+            return profile
 
-    response = requests.get(url, headers=headers)
+    session = get_clients().session("coresignal")
+    response = get_rate_limiter().call(RATE_LIMIT_ENDPOINT, lambda: session.get(COLLECT_PATH + str(company_id)))
     if response.status_code != 200:
         raise Exception(f"Coresignal collect error {response.status_code}: {response.text}")
 
-    return response.json()
\ No newline at end of file
+    profile = response.json()
+    cache.record(company_id, profile)
+    get_company_store().add(company_id, profile)
+    return profile
+
+
+@traced("coresignal.collect_company")
+async def _collect_async(company_id, cache: CompanyProfileCache, store: CompanyStore) -> dict:
+    client = get_clients().async_client("coresignal")
+    response = await get_rate_limiter().call_async(RATE_LIMIT_ENDPOINT, lambda: client.get(COLLECT_PATH + str(company_id)))
+    if response.status_code != 200:
+        raise Exception(f"Coresignal collect error {response.status_code}: {response.text}")
+    profile = response.json()
+    cache.record(company_id, profile)
+    store.add(company_id, profile)
+    return profile
+
+
+async def collect_companies_async(company_ids, concurrency=CORESIGNAL_COLLECT_CONCURRENCY, use_cache=True, *, cache: CompanyProfileCache, store: CompanyStore) -> dict:
+    """
+    Collects many company profiles with at most `concurrency` requests in
+    flight. Returns {company_id: profile}; ids that failed are left out so
+    they can be retried.
+
+    `cache` and `store` are get_company_profile_cache() and get_company_store()
+    resolved by the caller: on the client loop's thread a first call has no
+    script run to attach to.
+    """
+    profiles = {}
+    missing = []
+    stale_ids = []
+    for cid in dict.fromkeys(company_ids):
+        profile, stale = cache.lookup(cid) if use_cache else (None, False)
+        if profile is None:
+            missing.append(cid)
+        else:
+            profiles[cid] = profile
+            if stale:
+                stale_ids.append(cid)
+
+    if stale_ids:
+        refresh_in_background(stale_ids, concurrency, cache, store)
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(cid):
+        async with semaphore:
+            try:
+                return cid, await _collect_async(cid, cache, store)
+            except QuotaExhausted:
+                raise
+            except Exception as e:
+                log.warning("❌ Failed to collect company %s: %s", cid, e)
+                return cid, None
+
+    log.info("🏢 Collecting %d company profiles (%d from cache)", len(missing), len(profiles))
+    for cid, profile in await asyncio.gather(*(run_one(c) for c in missing)):
+        if profile is not None:
+            profiles[cid] = profile
+    return profiles
+
+
+def collect_companies(company_ids, concurrency=CORESIGNAL_COLLECT_CONCURRENCY, use_cache=True) -> dict:
+    """Blocking wrapper around collect_companies_async."""
+    return get_clients().run(collect_companies_async(list(company_ids), concurrency, use_cache, cache=get_company_profile_cache(), store=get_company_store()))
+
+
+def refresh_in_background(company_ids, concurrency=CORESIGNAL_COLLECT_CONCURRENCY, cache: CompanyProfileCache | None = None, store: CompanyStore | None = None):
+    """
+    Re-collects stale profiles on the shared loop without waiting for them.
+    Pass `cache` and `store` when calling from the loop's thread.
+    """
+    if cache is None:
+        cache = get_company_profile_cache()
+    if store is None:
+        store = get_company_store()
+    with _refreshing_lock:
+        ids = [cid for cid in company_ids if cid not in _refreshing]
+        _refreshing.update(ids)
+    if not ids:
+        return
+
+    async def refresh():
+        try:
+            await collect_companies_async(ids, concurrency, use_cache=False, cache=cache, store=store)
+        finally:
+            with _refreshing_lock:
+                _refreshing.difference_update(ids)
+
+    asyncio.run_coroutine_threadsafe(refresh(), get_clients().loop)
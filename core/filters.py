@@ -1 +1,260 @@
 # core/filters.py
+
+import os
+import re
+
+import streamlit as st
+
+from config import CACHE_DIR, QUERY_FILTERS_CACHE_TTL
+from core.filter_options import company_sizes, countries, industries
+from utils.logger import get_logger
+from utils.openai_utils import call_openai_chat_completion
+from utils.response_cache import ResponseCache, cache_key
+
+log = get_logger(__name__)
+
+CACHE_NAMESPACE = "parse_user_query_to_filters"
+
+# Everyday words for the most searched industries and countries
+INDUSTRY_ALIASES = {
+    "tech": "Technology, Information and Internet",
+    "technology": "Technology, Information and Internet",
+    "software": "Software Development",
+    "saas": "Software Development",
+    "it services": "IT Services and IT Consulting",
+    "it consulting": "IT Services and IT Consulting",
+    "fintech": "Financial Services",
+    "finance": "Financial Services",
+    "financial": "Financial Services",
+    "bank": "Banking",
+    "banks": "Banking",
+    "banking": "Banking",
+    "insurance": "Insurance",
+    "consulting": "Business Consulting and Services",
+    "healthcare": "Hospitals and Health Care",
+    "health care": "Hospitals and Health Care",
+    "pharma": "Pharmaceutical Manufacturing",
+    "pharmaceutical": "Pharmaceutical Manufacturing",
+    "biotech": "Biotechnology Research",
+    "edtech": "E-Learning Providers",
+    "education": "Education",
+    "retail": "Retail",
+    "ecommerce": "Online and Mail Order Retail",
+    "e-commerce": "Online and Mail Order Retail",
+    "marketing": "Marketing Services",
+    "advertising": "Advertising Services",
+    "real estate": "Real Estate",
+    "construction": "Construction",
+    "automotive": "Automotive",
+    "telecom": "Telecommunications",
+    "telecoms": "Telecommunications",
+    "media": "Media Production",
+    "gaming": "Computer Games",
+    "hospitality": "Hospitality",
+}
+COUNTRY_ALIASES = {
+    "uk": "United Kingdom",
+    "u.k.": "United Kingdom",
+    "britain": "United Kingdom",
+    "great britain": "United Kingdom",
+    "england": "United Kingdom",
+    "usa": "United States",
+    "america": "United States",
+    "uae": "United Arab Emirates",
+}
+
+# Words that carry no filter by themselves; anything else left over after
+# parsing means the rule parser did not understand the whole query
+FILLER_WORDS = {
+    "find", "get", "show", "list", "give", "me", "search", "for", "look", "looking", "i", "want", "need",
+    "all", "some", "any", "the", "a", "an", "of", "and", "or", "with", "in", "at", "from", "based", "located",
+    "headquartered", "hq", "companies", "company", "businesses", "business", "firms", "firm", "organizations",
+    "organisations", "that", "which", "have", "has", "having", "are", "is", "top", "please", "employees",
+    "employee", "staff", "people", "workers", "sector", "industry", "industries", "field", "space",
+}
+
+_COUNT = re.compile(r"\b(?:top\s+)?(\d[\d,]*)\s+(?:[a-z&\-]+\s+){0,3}?(?:companies|company|businesses|firms|organi[sz]ations)\b")
+_LEADING_COUNT = re.compile(r"^(?:(?:find|get|show|list|give|me|search|for|top)\s+)*(\d[\d,]*)\b(?!\s*(?:k\b|\+|-|employees|employee|staff|people))")
+_EMPLOYEES_GTE = re.compile(
+    r"\b(more than|over|above|at least|min(?:imum)?(?: of)?|>=?|\+)\s*(\d[\d,]*)(k)?\+?\s*(?:employees|employee|staff|people|workers)\b"
+)
+_EMPLOYEES_PLUS = re.compile(r"\b(\d[\d,]*)(k)?\s*\+\s*(?:employees|employee|staff|people|workers)\b")
+_EMPLOYEES_RANGE = re.compile(r"\b(?:between\s+)?(\d[\d,]*)\s*(?:-|to|and)\s*(\d[\d,]*)\s*(?:employees|employee|staff|people)\b")
+# "US" is only the country in capitals: lowercase it is the pronoun ("give us 10 companies")
+_US = re.compile(r"(?<![\w.])U\.?S\.?(?!\w)")
+_US_LOWER = re.compile(r"(?<![\w.])u\.?s\.?(?!\w)")
+_LOCATION = re.compile(r"\b(?:in|based in|located in|headquartered in|from)\s+([A-Z][\w'\-]*(?:\s+[A-Z][\w'\-]*)*)")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercased query with punctuation and extra spaces removed, used as the cache key."""
+    query = re.sub(r"[^\w\s+\-&.,]", " ", query.lower())
+    return re.sub(r"\s+", " ", query).strip(" .,")
+
+
+def _number(text: str, thousands: str | None = None) -> int:
+    value = int(text.replace(",", ""))
+    return value * 1000 if thousands else value
+
+
+def _size_for_range(low: int, high: int) -> str | None:
+    for size in company_sizes:
+        bounds = re.findall(r"\d[\d,]*", size)
+        if len(bounds) == 2 and _number(bounds[0]) == low and _number(bounds[1]) == high:
+            return size
+    return None
+
+
+def _phrase_pattern(names, aliases) -> tuple[re.Pattern, dict]:
+    """
+    One compiled alternation over every known phrase (lowercased), longest
+    first so "real estate agents and brokers" wins over "real estate".
+    """
+    phrases = {name.lower(): name for name in names}
+    phrases.update(aliases)
+    ordered = sorted(phrases, key=len, reverse=True)
+    pattern = re.compile(r"(?<![\w.])(" + "|".join(re.escape(p) for p in ordered) + r")(?!\w)")
+    return pattern, phrases
+
+
+_INDUSTRY_PHRASES = _phrase_pattern(industries, INDUSTRY_ALIASES)
+_COUNTRY_PHRASES = _phrase_pattern(countries, COUNTRY_ALIASES)
+
+
+def _take_phrase(text: str, phrases) -> tuple[str | None, str]:
+    """Finds the first known phrase in text; returns (value, text with the phrase blanked out)."""
+    pattern, values = phrases
+    match = pattern.search(text)
+    if not match:
+        return None, text
+    return values[match.group(1)], text[:match.start()] + " " + text[match.end():]
+
+
+def parse_query_rules(query: str) -> tuple[dict, bool]:
+    """
+    Deterministic parser for the common shapes of a search query: a result
+    count, an employee threshold or size range, a country, a city and a known
+    industry. Returns (filters, complete); `complete` is False when words were
+    left over that the rules did not understand.
+    """
+    filters = {}
+    text = normalize_query(query)
+
+    match = _EMPLOYEES_GTE.search(text)
+    if match:
+        value = _number(match.group(2), match.group(3))
+        strict = match.group(1) in ("more than", "over", "above", ">")
+        filters["employees_count_gte"] = value + 1 if strict else value
+        text = text[:match.start()] + " " + text[match.end():]
+    else:
+        match = _EMPLOYEES_PLUS.search(text) or _EMPLOYEES_RANGE.search(text)
+        if match and match.re is _EMPLOYEES_PLUS:
+            filters["employees_count_gte"] = _number(match.group(1), match.group(2))
+            text = text[:match.start()] + " " + text[match.end():]
+        elif match:
+            size = _size_for_range(_number(match.group(1)), _number(match.group(2)))
+            if size:
+                filters["size"] = size
+                text = text[:match.start()] + " " + text[match.end():]
+
+    match = _COUNT.search(text) or _LEADING_COUNT.search(text)
+    if match:
+        filters["max_results"] = _number(match.group(1))
+        text = text[:match.start(1)] + " " + text[match.end(1):]
+
+    country, text = _take_phrase(text, _COUNTRY_PHRASES)
+    us_mentions = len(_US.findall(query))
+    if not country and us_mentions:
+        country = "United States"
+        text = _US_LOWER.sub(" ", text, count=us_mentions)
+    if country:
+        filters["country"] = country
+
+    # A capitalized place after "in"/"based in" that is not a country is a city or region
+    for match in _LOCATION.finditer(query):
+        place = match.group(1).strip()
+        if place.lower() in (country or "").lower() or place.lower() in COUNTRY_ALIASES or _US.match(query, match.start(1)):
+            continue
+        if _take_phrase(place.lower(), _COUNTRY_PHRASES)[0]:
+            continue
+        filters["location"] = place
+        text = re.sub(rf"\b{re.escape(place.lower())}\b", " ", text, count=1)
+        break
+
+    industry, text = _take_phrase(text, _INDUSTRY_PHRASES)
+    if industry:
+        filters["industry"] = industry
+
+    leftover = [w for w in re.findall(r"[a-z0-9][a-z0-9'\-]*", text) if w not in FILLER_WORDS]
+    return filters, bool(filters) and not leftover
+
+
+def _llm_prompt(query: str) -> str:
+    return (
+        "Convert this company search request into JSON filters for the Coresignal company search.\n"
+        "Use only these keys, and leave out any key the request does not mention:\n"
+        '- "max_results": number of companies requested (integer)\n'
+        '- "employees_count_gte": minimum number of employees (integer)\n'
+        f'- "size": one of {company_sizes}\n'
+        '- "industry": a LinkedIn industry name, e.g. "Software Development", "Financial Services"\n'
+        '- "country": full country name, e.g. "United Kingdom"\n'
+        '- "location": city or region\n'
+        "Answer with the JSON object only.\n\n"
+        f"Request: {query}"
+    )
+
+
+def _clean_llm_filters(raw: dict) -> dict:
+    """Keeps only known keys and values the search form can actually use."""
+    filters = {}
+    for key in ("max_results", "employees_count_gte"):
+        try:
+            if raw.get(key) is not None:
+                filters[key] = int(raw[key])
+        except (TypeError, ValueError):
+            pass
+    if raw.get("size") in company_sizes:
+        filters["size"] = raw["size"]
+    industry = _take_phrase(str(raw.get("industry") or "").lower(), _INDUSTRY_PHRASES)[0]
+    if industry:
+        filters["industry"] = industry
+    country = _take_phrase(str(raw.get("country") or "").lower(), _COUNTRY_PHRASES)[0]
+    if country:
+        filters["country"] = country
+    if raw.get("location"):
+        filters["location"] = str(raw["location"]).strip()
+    return filters
+
+
+@st.cache_resource
+def get_query_cache() -> ResponseCache:
+    """LLM-parsed filters by normalized query, shared by every session."""
+    return ResponseCache(os.path.join(CACHE_DIR, "query_filters.sqlite3"), ttl=QUERY_FILTERS_CACHE_TTL)
+
+
+def parse_user_query_to_filters(query: str, use_llm: bool = True) -> dict:
+    """
+    Turns a free-text request ("50 tech companies in London with more than
+    1000 employees") into search filters. The rule parser answers the common
+    cases locally; only queries it cannot fully parse go to the LLM, whose
+    answers are cached by normalized query.
+    """
+    filters, complete = parse_query_rules(query)
+    if complete or not use_llm:
+        return filters
+
+    cache = get_query_cache()
+    key = cache_key(CACHE_NAMESPACE, [("query", normalize_query(query))])
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        log.info("🤖 Parsing query with the LLM: %s", query)
+        llm_filters = _clean_llm_filters(call_openai_chat_completion(_llm_prompt(query)))
+    except Exception as e:
+        log.warning("❌ LLM query parsing failed, using rule-based filters: %s", e)
+        return filters
+
+    cache.set(key, llm_filters)
+    return llm_filters
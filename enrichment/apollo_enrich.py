@@ -0,0 +1,120 @@
+# enrichment/apollo_enrich.py
+
+import asyncio
+
+import requests
+
+from config import APOLLO_SEARCH_CONCURRENCY
+from enrichment.enrichment_ledger import EnrichmentLedger, get_enrichment_ledger
+from utils.http_client import get_clients
+from utils.logger import get_logger
+from utils.rate_limiter import QuotaExhausted, get_rate_limiter
+from utils.tracing import traced
+
+log = get_logger(__name__)
+
+MATCH_PATH = "people/match"
+RATE_LIMIT_ENDPOINT = "apollo.people_match"
+BULK_MATCH_PATH = "people/bulk_match"
+BULK_RATE_LIMIT_ENDPOINT = "apollo.people_bulk_match"
+# Apollo accepts at most 10 people per bulk_match call
+BULK_MATCH_SIZE = 10
+
+
+@traced("apollo.enrich_contact_email")
+def enrich_contact_email(person_id):
+    """Enrich contact with email using Apollo API"""
+    if not person_id:
+        return None
+
+    # People enriched before (by anyone) are answered from the ledger
+    ledger = get_enrichment_ledger()
+    known = ledger.lookup(person_id)
+    if known is not None:
+        return known["email"]
+
+    session = get_clients().session("apollo")
+
+    try:
+        log.debug("🔍 Enriching contact ID: %s", person_id, extra={"sample": True})
+        response = get_rate_limiter().call(RATE_LIMIT_ENDPOINT, lambda: session.post(MATCH_PATH, params={"id": person_id}))
+        response.raise_for_status()
+        data = response.json()
+
+        email = (data.get("person") or {}).get("email")
+        log.debug("📧 Email found for %s: %s", person_id, "yes" if email else "no", extra={"sample": True})
+        ledger.record(person_id, email)
+        return email
+
+    except QuotaExhausted:
+        raise
+    except requests.exceptions.RequestException as e:
+        log.warning("❌ Failed to enrich contact %s: %s", person_id, e)
+        return None
+    except Exception as e:
+        log.error("❌ Error processing enrichment response for %s: %s", person_id, e)
+        return None
+
+
+@traced("apollo.bulk_match")
+async def _bulk_match_chunk(person_ids: list[str]) -> dict:
+    client = get_clients().async_client("apollo")
+    payload = {"details": [{"id": pid} for pid in person_ids]}
+    try:
+        response = await get_rate_limiter().call_async(
+            BULK_RATE_LIMIT_ENDPOINT,
+            lambda: client.post(BULK_MATCH_PATH, json=payload)
+        )
+        response.raise_for_status()
+        matches = response.json().get("matches") or []
+    except QuotaExhausted:
+        raise
+    except Exception as e:
+        log.warning("❌ Bulk enrichment failed for %d contacts: %s", len(person_ids), e)
+        return {}
+
+    # Matches come back in request order; unmatched people are null
+    emails = {pid: None for pid in person_ids}
+    for pid, match in zip(person_ids, matches):
+        if match:
+            emails[match.get("id") or pid] = match.get("email")
+    return emails
+
+
+async def enrich_contacts_bulk_async(person_ids, ledger: EnrichmentLedger, concurrency=APOLLO_SEARCH_CONCURRENCY) -> dict:
+    """
+    Enriches many people through people/bulk_match, ten per call, with at most
+    `concurrency` calls in flight. Returns {person_id: email or None}; people
+    whose chunk failed are left out so they can be retried.
+
+    `ledger` comes from the caller: this runs on the client loop's thread,
+    where a first get_enrichment_ledger() call has no script run to attach to.
+    """
+    emails = {}
+    missing = []
+    for pid in dict.fromkeys(p for p in person_ids if p):
+        known = ledger.lookup(pid)
+        if known is not None:
+            emails[pid] = known["email"]
+        else:
+            missing.append(pid)
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_chunk(chunk):
+        async with semaphore:
+            result = await _bulk_match_chunk(chunk)
+        # Recorded as soon as the chunk is paid for: a later chunk raising
+        # (e.g. QuotaExhausted) must not lose it
+        for pid, email in result.items():
+            ledger.record(pid, email)
+            emails[pid] = email
+
+    chunks = [missing[i:i + BULK_MATCH_SIZE] for i in range(0, len(missing), BULK_MATCH_SIZE)]
+    await asyncio.gather(*(run_chunk(c) for c in chunks))
+    return emails
+
+
+def enrich_contacts_bulk(person_ids, concurrency=APOLLO_SEARCH_CONCURRENCY) -> dict:
+    """Blocking wrapper around enrich_contacts_bulk_async."""
+    return get_clients().run(enrich_contacts_bulk_async(person_ids, get_enrichment_ledger(), concurrency))
@@ -0,0 +1,215 @@
+# enrichment/apollo_search.py
+
+import asyncio
+import contextlib
+import functools
+import os
+
+import httpx
+import streamlit as st
+
+from config import (
+    APOLLO_SEARCH_CONCURRENCY, APOLLO_SEARCH_PER_PAGE, CACHE_DIR,
+    SEARCH_CACHE_TTL, SEARCH_CACHE_MEMORY_ENTRIES, SEARCH_CACHE_MEMORY_MB, SEARCH_CACHE_MAX_MB
+)
+from utils.http_client import get_clients
+from utils.logger import get_logger
+from utils.rate_limiter import QuotaExhausted, get_rate_limiter
+from utils.response_cache import ResponseCache, cache_key
+from utils.tracing import span, traced
+
+log = get_logger(__name__)
+
+SEARCH_PATH = "mixed_people/search"
+RATE_LIMIT_ENDPOINT = "apollo.mixed_people_search"
+# Cached values are whole result pages: {"people": [...], "total_results": n}
+CACHE_NAMESPACE = "mixed_people/search#page"
+# Apollo never returns more than 500 pages for a search
+MAX_PAGES = 500
+
+
+class SearchFailed(Exception):
+    """A result page could not be fetched, as opposed to a search that found nobody."""
+
+
+@st.cache_resource
+def get_search_cache() -> ResponseCache:
+    """Search response cache shared by every session in the server process."""
+    return ResponseCache(
+        os.path.join(CACHE_DIR, "apollo_search.sqlite3"),
+        ttl=SEARCH_CACHE_TTL,
+        max_memory_entries=SEARCH_CACHE_MEMORY_ENTRIES,
+        max_memory_bytes=SEARCH_CACHE_MEMORY_MB * 1024 * 1024,
+        max_disk_bytes=SEARCH_CACHE_MAX_MB * 1024 * 1024
+    )
+
+
+def build_search_params(company_name, locations, job_titles=None, seniorities=None, domains=None, per_page=50, page=1) -> list[tuple]:
+    """
+    Builds the query parameter list sent to Apollo's mixed_people/search endpoint.
+    """
+    params = []
+    if job_titles:  # Only add job titles if provided
+        for title in job_titles:
+            params.append(("person_titles[]", title))
+        params.append(("include_similar_titles", "true"))
+    for loc in locations:
+        params.append(("person_locations[]", loc))
+    if seniorities:
+        for s in seniorities:
+            params.append(("person_seniorities[]", s))
+    if domains:
+        for d in domains:
+            params.append(("q_organization_domains_list[]", d))
+    if company_name:  # Only add company name if it's not empty
+        params.append(("q_organization_names[]", company_name))
+    params.append(("contact_email_status[]", "verified"))
+    params.append(("per_page", str(per_page)))
+    params.append(("page", str(page)))
+    return params
+
+
+def total_pages(total_results, per_page) -> int:
+    return min(MAX_PAGES, -(-int(total_results or 0) // per_page))
+
+
+@traced("apollo.search_people")
+async def search_people_page_async(company_name, locations, job_titles=None, seniorities=None, domains=None, per_page=50, page=1, use_cache=True, *, cache: ResponseCache) -> dict:
+    """
+    Fetches one page of mixed_people/search results. Must run on the shared
+    client loop (see utils.http_client.ApiClients).
+    Returns {"people": [...], "total_results": n}; raises SearchFailed when
+    the page could not be fetched.
+    """
+    params = build_search_params(company_name, locations, job_titles, seniorities, domains, per_page, page)
+    key = cache_key(CACHE_NAMESPACE, params)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    label = domains[0] if domains else company_name
+    client = get_clients().async_client("apollo")
+    try:
+        resp = await get_rate_limiter().call_async(
+            RATE_LIMIT_ENDPOINT,
+            lambda: client.post(SEARCH_PATH, params=params)
+        )
+        resp.raise_for_status()
+        with span("apollo.parse_json"):
+            data = resp.json()
+        result = {"people": data.get("people", []), "total_results": data.get("total_results", 0)}
+        cache.set(key, result)
+        return result
+    except QuotaExhausted:
+        raise
+    except httpx.HTTPStatusError as e:
+        log.warning("❌ Request failed for %s: %s %s", label, e.response.status_code, e.response.text[:500],
+                    extra={"status": e.response.status_code})
+        raise SearchFailed(f"page {page}: HTTP {e.response.status_code}") from e
+    except Exception as e:
+        log.warning("❌ Request failed for %s: %s", label, e)
+        raise SearchFailed(f"page {page}: {e or type(e).__name__}") from e
+
+
+async def search_pages_async(company_name, locations, job_titles=None, seniorities=None, domains=None, per_page=APOLLO_SEARCH_PER_PAGE, max_results=None, use_cache=True, *, cache: ResponseCache):
+    """
+    Walks pages 1..N of a search and yields each page's people.
+    The next page is fetched while the caller processes the current one, and
+    fetching stops as soon as `max_results` people were seen.
+    """
+    fetch = functools.partial(search_people_page_async, company_name, locations, job_titles, seniorities, domains, per_page, use_cache=use_cache, cache=cache)
+    fetched = 0
+    page = 1
+    task = asyncio.create_task(fetch(page=page))
+    try:
+        while task is not None:
+            data = await task
+            people = data["people"]
+            if max_results is not None:
+                people = people[:max_results - fetched]
+            fetched += len(people)
+            more = people and page < total_pages(data["total_results"], per_page) and (max_results is None or fetched < max_results)
+            page += 1
+            task = asyncio.create_task(fetch(page=page)) if more else None
+            if people:
+                yield people
+    finally:
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+async def search_domains_async(domains, locations, job_titles=None, seniorities=None, concurrency=APOLLO_SEARCH_CONCURRENCY, use_cache=True, max_per_domain=None, max_total=None, *, cache: ResponseCache):
+    """
+    Searches every domain concurrently (at most `concurrency` domains in flight)
+    and yields (domain, people, error) as soon as each domain finishes.
+    Each domain is read page by page until `max_per_domain` people were found;
+    the whole search stops once `max_total` people were found overall.
+    Each person is tagged with the domain it was found under in "searched_company".
+    `error` is None when the domain was searched in full; otherwise it says
+    which page failed, and `people` holds what was found before it.
+
+    `cache` is get_search_cache() resolved by the caller: on the client loop's
+    thread a first call has no script run to attach to.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    found = 0
+
+    def target_reached():
+        return max_total is not None and found >= max_total
+
+    async def run_one(domain):
+        nonlocal found
+        people = []
+        error = None
+        async with semaphore:
+            if target_reached():
+                return domain, people, error
+            pages = search_pages_async(
+                company_name="",  # Empty company name when using domains
+                locations=locations,
+                job_titles=job_titles,
+                seniorities=seniorities,
+                domains=[domain],
+                max_results=max_per_domain,
+                use_cache=use_cache,
+                cache=cache
+            )
+            async with contextlib.aclosing(pages):
+                try:
+                    async for page_people in pages:
+                        people.extend(page_people)
+                        found += len(page_people)
+                        if target_reached():
+                            break
+                except SearchFailed as e:
+                    error = str(e)
+        for p in people:
+            p["searched_company"] = domain
+        return domain, people, error
+
+    tasks = [asyncio.create_task(run_one(d)) for d in domains]
+    yielded = 0
+    try:
+        for finished in asyncio.as_completed(tasks):
+            domain, people, error = await finished
+            if max_total is not None:
+                people = people[:max(0, max_total - yielded)]
+            yielded += len(people)
+            yield domain, people, error
+            if max_total is not None and yielded >= max_total:
+                break
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def iter_search_domains(domains, locations, job_titles=None, seniorities=None, concurrency=APOLLO_SEARCH_CONCURRENCY, use_cache=True, max_per_domain=None, max_total=None):
+    """
+    Synchronous generator over search_domains_async for callers such as the
+    Streamlit script: yields (domain, people, error) in completion order.
+    """
+    agen = search_domains_async(domains, locations, job_titles, seniorities, concurrency, use_cache, max_per_domain, max_total, cache=get_search_cache())
+    yield from get_clients().stream(agen)
@@ -0,0 +1,50 @@
+# enrichment/enrichment_ledger.py
+
+import os
+import time
+
+import streamlit as st
+
+from config import CACHE_DIR, ENRICHMENT_TTL, ENRICHMENT_NEGATIVE_TTL
+from utils.response_cache import ResponseCache
+
+# The ledger is never trimmed for size: an evicted entry means paying again
+LEDGER_MAX_BYTES = 10 * 1024 * 1024 * 1024
+
+
+class EnrichmentLedger:
+    """
+    Persistent record of every Apollo people/match answer, keyed by person id.
+    Emails are kept for `ttl` seconds; "no email" answers are kept for the
+    shorter `negative_ttl`, since Apollo may find one later.
+    """
+
+    def __init__(self, path: str, ttl: float = ENRICHMENT_TTL, negative_ttl: float = ENRICHMENT_NEGATIVE_TTL):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._cache = ResponseCache(path, ttl=ttl, max_memory_entries=50000, max_disk_bytes=LEDGER_MAX_BYTES)
+
+    def lookup(self, person_id: str) -> dict | None:
+        """
+        Returns {"email": ..., "fetched_at": ...} when the person has been
+        enriched recently (email is None for a negative result), else None.
+        """
+        return self._cache.get(person_id)
+
+    def record(self, person_id: str, email: str | None):
+        entry = {"email": email, "fetched_at": time.time()}
+        self._cache.set(person_id, entry, ttl=self.ttl if email else self.negative_ttl)
+
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+
+
+@st.cache_resource
+def get_enrichment_ledger() -> EnrichmentLedger:
+    """Ledger shared by every session in the server process."""
+    return EnrichmentLedger(os.path.join(CACHE_DIR, "enrichment_ledger.sqlite3"))
@@ -0,0 +1,135 @@
+# enrichment/person_store.py
+
+import json
+import os
+import threading
+import uuid
+import weakref
+
+import pandas as pd
+
+from config import CACHE_DIR, KEEP_RAW_PEOPLE
+
+# Column names used by the results grid and the exports
+COLUMNS = ["Name", "Title", "Company", "Location", "LinkedIn", "ID"]
+
+
+class PersonRecord:
+    """The handful of Apollo person fields the app actually uses."""
+
+    __slots__ = ("id", "name", "title", "company", "location", "linkedin", "seniority")
+
+    def __init__(self, id, name, title, company, location, linkedin, seniority=None):
+        self.id = id
+        self.name = name
+        self.title = title
+        self.company = company
+        self.location = location
+        self.linkedin = linkedin
+        self.seniority = seniority
+
+    @classmethod
+    def from_apollo(cls, p: dict, searched_company=None):
+        return cls(
+            id=p.get("id"),  # Keep Apollo API ID for enrichment
+            name=p.get("name"),
+            title=p.get("title"),
+            company=searched_company or p.get("searched_company"),  # Use the company that was searched for
+            location=p.get("present_raw_address") or f"{p.get('city')}, {p.get('country')}",
+            linkedin=p.get("linkedin_url"),
+            seniority=p.get("seniority")
+        )
+
+    def as_row(self) -> dict:
+        return {
+            "Name": self.name,
+            "Title": self.title,
+            "Company": self.company,
+            "Location": self.location,
+            "LinkedIn": self.linkedin,
+            "ID": self.id
+        }
+
+    def __repr__(self):
+        return f"PersonRecord({self.id!r}, {self.name!r}, {self.company!r})"
+
+
+class PersonStore:
+    """
+    Append-only store of search results, projected to PersonRecord at ingest so
+    the raw Apollo payloads (employment history, organization blob, ...) are
+    not kept in server memory. With `keep_raw=True` the raw payloads are
+    appended to a JSONL file on disk and can be read back by person id; the
+    file is deleted along with the store (or at exit).
+    """
+
+    def __init__(self, keep_raw: bool = KEEP_RAW_PEOPLE):
+        self._records = []
+        self._lock = threading.Lock()
+        self.version = 0
+        self.raw_path = None
+        self._raw_offsets = {}
+        if keep_raw:
+            raw_dir = os.path.join(CACHE_DIR, "raw_people")
+            os.makedirs(raw_dir, exist_ok=True)
+            self.raw_path = os.path.join(raw_dir, f"{uuid.uuid4().hex}.jsonl")
+            weakref.finalize(self, _remove_file, self.raw_path)
+
+    def extend(self, people, searched_company=None):
+        records = [PersonRecord.from_apollo(p, searched_company) for p in people]
+        with self._lock:
+            if self.raw_path and people:
+                with open(self.raw_path, "ab") as f:
+                    for p in people:
+                        self._raw_offsets[p.get("id")] = f.tell()
+                        f.write(json.dumps(p, ensure_ascii=False).encode("utf-8") + b"\n")
+            self._records.extend(records)
+            self.version += 1
+
+    def records(self) -> list[PersonRecord]:
+        """Snapshot of the records, safe to use while a search is still appending."""
+        with self._lock:
+            return list(self._records)
+
+    def raw(self, person_id: str) -> dict | None:
+        """Full Apollo payload of a person, if raw payloads are being kept."""
+        offset = self._raw_offsets.get(person_id)
+        if offset is None:
+            return None
+        with open(self.raw_path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def columns(self) -> dict:
+        """Column-oriented view of the store, e.g. for DataFrames and exports."""
+        records = self.records()
+        return {
+            "Name": [r.name for r in records],
+            "Title": [r.title for r in records],
+            "Company": [r.company for r in records],
+            "Location": [r.location for r in records],
+            "LinkedIn": [r.linkedin for r in records],
+            "ID": [r.id for r in records],
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns(), columns=COLUMNS)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __bool__(self):
+        return bool(self._records)
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
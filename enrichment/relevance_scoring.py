@@ -0,0 +1,89 @@
+# enrichment/relevance_scoring.py
+
+import hashlib
+import json
+import os
+
+import streamlit as st
+
+from config import CACHE_DIR, RELEVANCE_BATCH_SIZE, RELEVANCE_SCORE_TTL
+from utils.logger import get_logger
+from utils.openai_batch import complete_prompts
+from utils.response_cache import ResponseCache
+
+log = get_logger(__name__)
+
+
+def criteria_hash(job_titles=None, seniorities=None) -> str:
+    """Hash of the search criteria; a score is only valid for the criteria it was computed for."""
+    criteria = {
+        "titles": sorted(t.strip().lower() for t in job_titles or []),
+        "seniorities": sorted(s.strip().lower() for s in seniorities or []),
+    }
+    return hashlib.sha256(json.dumps(criteria).encode("utf-8")).hexdigest()[:16]
+
+
+def _score_key(criteria: str, person_id: str) -> str:
+    return f"{criteria}:{person_id}"
+
+
+def scoring_prompt(records, job_titles=None, seniorities=None) -> str:
+    """One prompt scoring a batch of people; only the fields needed to judge fit are sent."""
+    people = [
+        {"id": r.id, "title": r.title or "", "seniority": r.seniority or "", "company": r.company or ""}
+        for r in records
+    ]
+    return (
+        "You rate how well people match a prospecting search.\n"
+        f"Wanted job titles: {', '.join(job_titles) if job_titles else 'any'}\n"
+        f"Wanted seniorities: {', '.join(seniorities) if seniorities else 'any'}\n"
+        "Give each person a score from 0 (clearly not a match) to 100 (exact match), based on "
+        "their title and seniority. Similar or equivalent titles in other languages count as a match.\n"
+        'Answer with JSON only: {"scores": {"<id>": <score>, ...}}\n\n'
+        f"People:\n{json.dumps(people, ensure_ascii=False)}"
+    )
+
+
+@st.cache_resource
+def get_score_cache() -> ResponseCache:
+    """Relevance scores keyed by criteria hash and person id, shared by every session."""
+    return ResponseCache(os.path.join(CACHE_DIR, "relevance_scores.sqlite3"), ttl=RELEVANCE_SCORE_TTL, max_memory_entries=50000)
+
+
+def score_people(records, job_titles=None, seniorities=None, batch_size=RELEVANCE_BATCH_SIZE) -> dict:
+    """
+    Scores PersonRecords against the searched titles and seniorities.
+    Returns {person_id: score 0-100}. Cached scores are reused; the rest are
+    packed `batch_size` people per prompt and sent concurrently. People whose
+    batch failed are left out.
+    """
+    criteria = criteria_hash(job_titles, seniorities)
+    cache = get_score_cache()
+    scores = {}
+    missing = []
+    for record in {r.id: r for r in records if r.id}.values():
+        cached = cache.get(_score_key(criteria, record.id))
+        if cached is not None:
+            scores[record.id] = cached
+        else:
+            missing.append(record)
+
+    if not missing:
+        return scores
+
+    batches = {str(i): missing[i:i + batch_size] for i in range(0, len(missing), batch_size)}
+    log.info("🎯 Scoring %d people in %d prompts (%d from cache)", len(missing), len(batches), len(scores))
+    results, errors = complete_prompts({i: scoring_prompt(batch, job_titles, seniorities) for i, batch in batches.items()})
+    for batch_id, error in errors.items():
+        log.error("❌ Relevance scoring failed for %d people: %s", len(batches[batch_id]), error)
+
+    for batch_id, answer in results.items():
+        batch_scores = (answer.get("scores") or {}) if isinstance(answer, dict) else {}
+        for record in batches[batch_id]:
+            try:
+                score = max(0, min(100, int(batch_scores[record.id])))
+            except (KeyError, TypeError, ValueError):
+                continue
+            scores[record.id] = score
+            cache.set(_score_key(criteria, record.id), score)
+    return scores
@@ -0,0 +1,69 @@
+# enrichment/result_views.py
+
+import pandas as pd
+
+from utils.tracing import span
+
+# Column order of the selected contacts table and its exports
+SELECTED_COLUMNS = ['Name', 'Title', 'Company', 'Location', 'Email', 'LinkedIn', 'ID']
+
+
+def get_page(items, page, page_size):
+    start = page * page_size
+    end = start + page_size
+    return items[start:end]
+
+
+class ResultsView:
+    """
+    Sorted rows of a PersonStore, rebuilt only when the store changes (its
+    version moves on every ingest) or the sort order changes. Paging,
+    selecting and other reruns just slice the cached list.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._rows = []
+
+    def rows(self, store, sort_by=None, scores=None, min_score=0) -> list:
+        """
+        `scores` ({person_id: relevance}) enables sort_by="Relevance" and drops
+        people scored below `min_score`; people not scored yet are kept.
+        """
+        key = (id(store), store.version, sort_by, id(scores), len(scores or ()), min_score)
+        if key != self._key:
+            with span("results.rows"):
+                self._rows = self._build_rows(store, sort_by, scores, min_score)
+            self._key = key
+        return self._rows
+
+    @staticmethod
+    def _build_rows(store, sort_by, scores, min_score) -> list:
+        rows = store.records()
+        if scores and min_score:
+            rows = [r for r in rows if scores.get(r.id, 100) >= min_score]
+        if sort_by == "Relevance" and scores is not None:
+            rows.sort(key=lambda r: -scores.get(r.id, -1))
+        elif sort_by:
+            attr = sort_by.lower()
+            rows.sort(key=lambda r: (getattr(r, attr) or "").lower())
+        return rows
+
+    def page(self, store, page, page_size, sort_by=None, scores=None, min_score=0) -> list:
+        return get_page(self.rows(store, sort_by, scores, min_score), page, page_size)
+
+
+class SelectionView:
+    """Display DataFrame of a ContactSelection, rebuilt only when the selection changes."""
+
+    def __init__(self):
+        self._key = None
+        self._frame = None
+
+    def frame(self, selection) -> pd.DataFrame:
+        key = (id(selection), selection.version)
+        if key != self._key:
+            with span("selection.frame"):
+                self._frame = pd.DataFrame(selection.contacts(), columns=SELECTED_COLUMNS)
+            self._key = key
+        return self._frame
@@ -0,0 +1,76 @@
+# enrichment/search_run.py
+
+import threading
+
+from config import APOLLO_SEARCH_CONCURRENCY
+from enrichment.apollo_search import get_search_cache, search_domains_async
+from enrichment.person_store import PersonStore
+from utils.http_client import get_clients
+from utils.jobs import AsyncJob, get_job_manager
+from utils.tracing import span
+
+
+class SearchRun(AsyncJob):
+    """
+    A domain search run as a background job on the shared client loop,
+    outside the Streamlit script run. People are appended to `results` as
+    each domain finishes, so the UI can render (and let users act on) partial
+    results while the rest of the domains are still being fetched, and a
+    reopened tab can pick the job up again by id.
+    """
+
+    kind = "search"
+
+    def __init__(self, domains, locations, job_titles=None, seniorities=None, concurrency=APOLLO_SEARCH_CONCURRENCY, use_cache=True, max_per_domain=None, max_total=None):
+        # Shared resources are resolved here, on the script thread that
+        # creates the run: the loop thread is not a script thread
+        super().__init__(get_clients().loop)
+        self._cache = get_search_cache()
+        self.domains = list(domains)
+        self.locations = locations
+        self.job_titles = job_titles
+        self.seniorities = seniorities
+        self.concurrency = concurrency
+        self.use_cache = use_cache
+        self.max_per_domain = max_per_domain
+        self.max_total = max_total
+
+        self.results = PersonStore()
+        self.domain_counts = {}  # domain -> people found, in completion order
+        self.failed = {}  # domain -> why its search stopped early
+        self.total = len(self.domains)
+        self._lock = threading.Lock()
+
+    @property
+    def done_count(self) -> int:
+        return len(self.domain_counts)
+
+    @property
+    def total_found(self) -> int:
+        return len(self.results)
+
+    async def run_async(self) -> PersonStore:
+        with span("search_run", root=True, domains=len(self.domains)):
+            async for domain, people, error in search_domains_async(
+                self.domains,
+                self.locations,
+                self.job_titles,
+                self.seniorities,
+                self.concurrency,
+                self.use_cache,
+                self.max_per_domain,
+                self.max_total,
+                cache=self._cache
+            ):
+                with self._lock:
+                    self.results.extend(people, searched_company=domain)
+                    self.domain_counts[domain] = len(people)
+                    if error:
+                        self.failed[domain] = error
+                    self.progress = len(self.domain_counts)
+        return self.results
+
+
+def start_search_run(domains, locations, job_titles=None, seniorities=None, concurrency=APOLLO_SEARCH_CONCURRENCY, use_cache=True, max_per_domain=None, max_total=None) -> SearchRun:
+    run = SearchRun(domains, locations, job_titles, seniorities, concurrency, use_cache, max_per_domain, max_total)
+    return get_job_manager().submit(run)
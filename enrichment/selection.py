@@ -0,0 +1,86 @@
+# enrichment/selection.py
+
+NO_EMAIL = "Not available"
+
+
+class ContactSelection:
+    """
+    Selected contacts keyed by Apollo person id.
+
+    The dict is the index: membership checks are O(1) whatever the number of
+    selections, and a person who shows up under several searched domains is
+    only ever selected once (the first selection wins). `version` changes on
+    every modification so views built from the selection can be cached.
+    """
+
+    def __init__(self, contacts=None):
+        self._contacts = {}
+        self.version = 0
+        if contacts:
+            self.add_many(contacts)
+
+    def __contains__(self, person_id) -> bool:
+        return person_id in self._contacts
+
+    def __len__(self):
+        return len(self._contacts)
+
+    def __bool__(self):
+        return bool(self._contacts)
+
+    def __iter__(self):
+        return iter(list(self._contacts.values()))
+
+    def get(self, person_id) -> dict | None:
+        return self._contacts.get(person_id)
+
+    def contacts(self) -> list[dict]:
+        return list(self._contacts.values())
+
+    def ids(self) -> list[str]:
+        return list(self._contacts)
+
+    def add(self, contact: dict) -> bool:
+        """Adds a contact (a dict with an "ID" key); False if already selected."""
+        person_id = contact["ID"]
+        if person_id in self._contacts:
+            return False
+        self._contacts[person_id] = contact
+        self.version += 1
+        return True
+
+    def add_many(self, contacts) -> int:
+        added = 0
+        for contact in contacts:
+            if contact["ID"] not in self._contacts:
+                self._contacts[contact["ID"]] = contact
+                added += 1
+        if added:
+            self.version += 1
+        return added
+
+    def remove(self, person_id) -> bool:
+        if self._contacts.pop(person_id, None) is None:
+            return False
+        self.version += 1
+        return True
+
+    def remove_many(self, person_ids) -> int:
+        removed = sum(1 for pid in person_ids if self._contacts.pop(pid, None) is not None)
+        if removed:
+            self.version += 1
+        return removed
+
+    def clear(self):
+        if self._contacts:
+            self._contacts.clear()
+            self.version += 1
+
+    def set_email(self, person_id, email):
+        contact = self._contacts.get(person_id)
+        if contact is not None and email:
+            contact["Email"] = email
+            self.version += 1
+
+    def missing_email(self) -> list[dict]:
+        return [c for c in self._contacts.values() if c["Email"] == NO_EMAIL]
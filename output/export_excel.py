@@ -0,0 +1,108 @@
+# output/export_excel.py
+
+import csv
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+
+from utils.tracing import traced
+
+EXPORT_FORMATS = {
+    "xlsx": {"label": "Excel", "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+    "csv": {"label": "CSV", "mime": "text/csv"},
+    "parquet": {"label": "Parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+# Number of built files kept in memory, keyed by content hash
+EXPORT_CACHE_SIZE = 8
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def rows_hash(rows, columns) -> str:
+    """Stable hash of the exported content, used as the export cache key."""
+    digest = hashlib.sha1("\x1f".join(columns).encode("utf-8"))
+    for row in rows:
+        digest.update("\x1e".join("" if row.get(c) is None else str(row.get(c)) for c in columns).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def write_xlsx(rows, columns, sheet_name="Sheet1") -> bytes:
+    """
+    Writes rows with xlsxwriter in constant_memory mode: each row is flushed
+    to disk as soon as it is written, so memory stays flat however many rows
+    are exported. Cells are written as plain strings (no URL/formula
+    detection), which is faster and avoids Excel's 65k hyperlinks-per-sheet cap.
+    """
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_urls": False, "strings_to_formulas": False})
+        sheet = workbook.add_worksheet(sheet_name)
+        bold = workbook.add_format({"bold": True})
+        sheet.write_row(0, 0, columns, bold)
+        for i, row in enumerate(rows, start=1):
+            for j, c in enumerate(columns):
+                value = row.get(c)
+                if value is not None:
+                    sheet.write_string(i, j, str(value))
+        workbook.close()
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+def write_csv(rows, columns) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(["" if row.get(c) is None else row.get(c) for c in columns])
+    # BOM so Excel opens accented names correctly
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def write_parquet(rows, columns) -> bytes:
+    table = pa.table({c: [None if row.get(c) is None else str(row.get(c)) for row in rows] for c in columns})
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
+
+
+@traced("export.build")
+def build_export(rows, columns, fmt="xlsx", sheet_name="Sheet1") -> bytes:
+    """
+    Builds the export file for `rows` (dicts) in the given format. Files are
+    cached by content hash, so asking again for an unchanged selection costs
+    nothing.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    rows = list(rows)
+    key = (fmt, sheet_name, rows_hash(rows, columns))
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    if fmt == "xlsx":
+        data = write_xlsx(rows, columns, sheet_name)
+    elif fmt == "csv":
+        data = write_csv(rows, columns)
+    else:
+        data = write_parquet(rows, columns)
+
+    with _cache_lock:
+        _cache[key] = data
+        while len(_cache) > EXPORT_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return data
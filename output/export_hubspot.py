@@ -0,0 +1,158 @@
+# output/export_hubspot.py
+
+import asyncio
+
+from enrichment.selection import NO_EMAIL
+from utils.http_client import get_clients
+from utils.logger import get_logger
+from utils.rate_limiter import get_rate_limiter
+
+log = get_logger(__name__)
+
+UPSERT_PATH = "crm/v3/objects/contacts/batch/upsert"
+CREATE_PATH = "crm/v3/objects/contacts/batch/create"
+RATE_LIMIT_ENDPOINT = "hubspot.contacts_batch"
+# HubSpot accepts at most 100 inputs per batch call
+BATCH_SIZE = 100
+HUBSPOT_CONCURRENCY = 4
+
+
+def contact_properties(contact: dict) -> dict:
+    """HubSpot contact properties for a selected contact."""
+    name_parts = (contact.get("Name") or "").split()
+    props = {
+        "firstname": name_parts[0] if name_parts else "",
+        "lastname": " ".join(name_parts[1:]),
+        "jobtitle": contact.get("Title") or "",
+        "company": contact.get("Company") or "",  # The searched company name
+        "linkedinbio": contact.get("LinkedIn") or "",
+        "city": contact.get("Location") or ""
+    }
+    email = contact_email(contact)
+    if email:
+        props["email"] = email
+    return props
+
+
+def contact_email(contact: dict) -> str | None:
+    email = contact.get("Email")
+    if not email or email == NO_EMAIL:
+        return None
+    return email.strip().lower()
+
+
+def build_batches(contacts) -> list[tuple[str, list[dict]]]:
+    """
+    Splits contacts into (path, contacts) batches of at most BATCH_SIZE.
+
+    Contacts with an email are upserted keyed by email, so pushing the same
+    people twice updates them instead of creating duplicates. Contacts without
+    an email can only be created.
+    """
+    with_email = {}
+    without_email = []
+    for contact in contacts:
+        email = contact_email(contact)
+        if email:
+            # HubSpot rejects a batch that upserts the same email twice
+            with_email.setdefault(email, contact)
+        else:
+            without_email.append(contact)
+
+    batches = []
+    upserts = list(with_email.values())
+    for i in range(0, len(upserts), BATCH_SIZE):
+        batches.append((UPSERT_PATH, upserts[i:i + BATCH_SIZE]))
+    for i in range(0, len(without_email), BATCH_SIZE):
+        batches.append((CREATE_PATH, without_email[i:i + BATCH_SIZE]))
+    return batches
+
+
+def _batch_payload(path: str, contacts: list[dict]) -> dict:
+    inputs = []
+    for contact in contacts:
+        item = {
+            "properties": contact_properties(contact),
+            # Echoed back in errors so failures can be tied to a record
+            "objectWriteTraceId": str(contact["ID"])
+        }
+        if path == UPSERT_PATH:
+            item["idProperty"] = "email"
+            item["id"] = contact_email(contact)
+        inputs.append(item)
+    return {"inputs": inputs}
+
+
+def _context_values(context: dict, key: str) -> list[str]:
+    """Error context values are lists of strings, sometimes a bare string."""
+    values = context.get(key) or []
+    if isinstance(values, str):
+        values = [values]
+    return [str(v) for v in values if v]
+
+
+def _error_message(error: dict) -> str:
+    return error.get("message") or error.get("category") or "Unknown error"
+
+
+async def _push_batch(path: str, contacts: list[dict]) -> list[dict]:
+    """Sends one batch; returns a failure entry per contact that was not written."""
+    client = get_clients().async_client("hubspot")
+    payload = _batch_payload(path, contacts)
+    try:
+        response = await get_rate_limiter().call_async(RATE_LIMIT_ENDPOINT, lambda: client.post(path, json=payload))
+        if response.status_code not in (200, 201, 207):
+            response.raise_for_status()
+        data = response.json()
+    except Exception as e:
+        log.warning("❌ HubSpot batch of %d contacts failed: %s", len(contacts), e)
+        return [{"ID": c["ID"], "Name": c.get("Name"), "error": str(e)} for c in contacts]
+
+    # 207 Multi-Status: some inputs were written, the others are listed in errors
+    by_id = {str(c["ID"]): c for c in contacts}
+    by_email = {contact_email(c): c for c in contacts if contact_email(c)}
+    failures = []
+    for error in data.get("errors") or []:
+        context = error.get("context") or {}
+        matched = []
+        for trace_id in _context_values(context, "objectWriteTraceId"):
+            if trace_id in by_id:
+                matched.append(by_id[trace_id])
+        for email in _context_values(context, "ids"):
+            if email.lower() in by_email:
+                matched.append(by_email[email.lower()])
+        if not matched:
+            # Error not tied to a record: report it against the whole batch
+            matched = contacts
+        for contact in matched:
+            failures.append({"ID": contact["ID"], "Name": contact.get("Name"), "error": _error_message(error)})
+    return failures
+
+
+async def push_contacts_async(contacts, concurrency=HUBSPOT_CONCURRENCY) -> dict:
+    """
+    Pushes contacts to HubSpot with the batch upsert/create APIs, at most
+    `concurrency` batches in flight. Returns {"pushed": n, "failed": [...]}
+    where each failure has the contact "ID", "Name" and the HubSpot "error".
+    """
+    batches = build_batches(contacts)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_batch(path, batch):
+        async with semaphore:
+            return await _push_batch(path, batch)
+
+    log.info("🚀 Pushing %d contacts to HubSpot in %d batches", sum(len(b) for _, b in batches), len(batches))
+    failed = {}
+    for failures in await asyncio.gather(*(run_batch(p, b) for p, b in batches)):
+        for failure in failures:
+            failed.setdefault(failure["ID"], failure)
+
+    total = sum(len(b) for _, b in batches)
+    log.info("✅ HubSpot push done: %d pushed, %d failed", total - len(failed), len(failed))
+    return {"pushed": total - len(failed), "failed": list(failed.values())}
+
+
+def push_contacts(contacts, concurrency=HUBSPOT_CONCURRENCY) -> dict:
+    """Blocking wrapper around push_contacts_async."""
+    return get_clients().run(push_contacts_async(list(contacts), concurrency))
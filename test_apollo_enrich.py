@@ -0,0 +1,27 @@
+import time
+
+import pytest
+
+from enrichment import apollo_enrich
+from enrichment.enrichment_ledger import EnrichmentLedger
+from utils.http_client import get_clients
+from utils.rate_limiter import QuotaExhausted
+
+
+def test_paid_chunks_survive_an_exhausted_quota(tmp_path, monkeypatch):
+    ledger = EnrichmentLedger(str(tmp_path / "ledger.sqlite3"))
+    bulk_match = apollo_enrich._bulk_match_chunk
+
+    async def second_chunk_exhausted(person_ids):
+        if "p10" in person_ids:
+            raise QuotaExhausted(apollo_enrich.BULK_RATE_LIMIT_ENDPOINT, time.time() + 3600)
+        return await bulk_match(person_ids)
+    monkeypatch.setattr(apollo_enrich, "_bulk_match_chunk", second_chunk_exhausted)
+
+    # One chunk at a time: the first one is paid for before the second fails
+    with pytest.raises(QuotaExhausted):
+        get_clients().run(apollo_enrich.enrich_contacts_bulk_async([f"p{i}" for i in range(20)], ledger, concurrency=1))
+
+    assert ledger.lookup("p0")["email"] == "p0@example.com"
+    assert ledger.lookup("p9") is not None
+    assert ledger.lookup("p10") is None
@@ -0,0 +1,123 @@
+import csv
+import os
+import signal
+import threading
+
+import cli
+
+# The real search, against the mock Apollo server (see conftest.py)
+search_domains = cli.iter_search_domains
+
+
+def write_domains(tmp_path, domains) -> str:
+    path = tmp_path / "domains.csv"
+    path.write_text("Company Domain Name\n" + "\n".join(domains) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def read_ids(path) -> list[str]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return [row["ID"] for row in csv.DictReader(f)]
+
+
+def stop_after(monkeypatch, finished: int, empty=()):
+    """The next run stops after `finished` domains as if Ctrl-C was pressed; domains in `empty` find nobody."""
+    def search(*args, **kwargs):
+        for n, (domain, people, error) in enumerate(search_domains(*args, **kwargs)):
+            if n == finished:
+                raise KeyboardInterrupt
+            yield domain, [] if domain in empty else people, error
+    monkeypatch.setattr(cli, "iter_search_domains", search)
+
+
+def record_searches(monkeypatch) -> list[str]:
+    searched = []
+
+    def search(domains, *args, **kwargs):
+        searched.extend(domains)
+        return search_domains(domains, *args, **kwargs)
+    monkeypatch.setattr(cli, "iter_search_domains", search)
+    return searched
+
+
+def test_resume_rewrites_a_half_written_domain(tmp_path, monkeypatch):
+    output = str(tmp_path / "contacts.csv")
+    argv = [write_domains(tmp_path, ["a.com", "b.com", "c.com"]), "-o", output, "--locations", "London", "--concurrency", "1"]
+
+    stop_after(monkeypatch, 1)
+    assert cli.main(argv) == 130
+    # A crash while b.com's rows were being written
+    with open(output, "a", encoding="utf-8") as f:
+        f.write("b.com-0,Half written\n")
+
+    searched = record_searches(monkeypatch)
+    assert cli.main(argv) == 0
+
+    assert searched == ["b.com", "c.com"]
+    ids = read_ids(output)
+    assert len(ids) == len(set(ids)) == 15
+    assert "Half written" not in open(output, encoding="utf-8-sig").read()
+    assert not os.path.exists(output + ".checkpoint")
+
+
+def test_retry_empty_searches_empty_domains_again(tmp_path, monkeypatch):
+    output = str(tmp_path / "contacts.csv")
+    argv = [write_domains(tmp_path, ["a.com", "b.com", "c.com"]), "-o", output, "--locations", "London", "--concurrency", "1"]
+
+    stop_after(monkeypatch, 2, empty={"a.com"})
+    assert cli.main(argv) == 130
+
+    searched = record_searches(monkeypatch)
+    assert cli.main(argv + ["--retry-empty"]) == 0
+
+    assert sorted(searched) == ["a.com", "c.com"]
+    ids = read_ids(output)
+    assert len(ids) == len(set(ids)) == 15
+    assert {i.split("-")[0] for i in ids} == {"a.com", "b.com", "c.com"}
+
+
+def test_failed_domains_are_retried(tmp_path, monkeypatch):
+    output = str(tmp_path / "contacts.csv")
+    argv = [write_domains(tmp_path, ["a.com", "b.com", "c.com"]), "-o", output, "--locations", "London", "--concurrency", "1", "--enrich"]
+
+    def search(*args, **kwargs):
+        for domain, people, error in search_domains(*args, **kwargs):
+            # b.com's second page fails; c.com's email lookup misses someone
+            yield domain, people[:2] if domain == "b.com" else people, "page 2: HTTP 503" if domain == "b.com" else error
+    enrich = cli.enrich_contacts_bulk
+    monkeypatch.setattr(cli, "iter_search_domains", search)
+    monkeypatch.setattr(cli, "enrich_contacts_bulk", lambda ids, *args: {k: v for k, v in enrich(ids, *args).items() if k != "c.com-0"})
+    assert cli.main(argv) == 1
+
+    checkpoint = cli.Checkpoint(output + ".checkpoint")
+    assert checkpoint.load()
+    assert checkpoint.done == {"a.com": 5}
+
+    monkeypatch.undo()
+    searched = record_searches(monkeypatch)
+    assert cli.main(argv) == 0
+
+    assert sorted(searched) == ["b.com", "c.com"]
+    with open(output, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 15
+    assert all(row["Email"] == f"{row['ID']}@example.com" for row in rows)
+
+
+def test_ctrl_c_while_waiting_on_the_loop(tmp_path):
+    output = str(tmp_path / "contacts.csv")
+    # Apollo's 100/min budget keeps this run waiting on the client loop for a while
+    domains = [f"slow{i}.com" for i in range(40)]
+    argv = [write_domains(tmp_path, domains), "-o", output, "--locations", "London", "--concurrency", "1"]
+
+    ctrl_c = threading.Timer(1.0, os.kill, (os.getpid(), signal.SIGINT))
+    ctrl_c.start()
+    try:
+        assert cli.main(argv) == 130
+    finally:
+        ctrl_c.cancel()
+
+    checkpoint = cli.Checkpoint(output + ".checkpoint")
+    assert checkpoint.load()
+    assert 0 < len(checkpoint.done) < len(domains)
+    assert len(read_ids(output)) == sum(checkpoint.done.values())
@@ -0,0 +1,61 @@
+from streamlit.testing.v1 import AppTest
+
+from enrichment.enrichment_ledger import get_enrichment_ledger
+from test_relevance_filter import run_search
+
+
+# Shared cached resources used by code on the client loop's thread must be
+# created by the calling script thread: a cache miss on the loop thread shows
+# Streamlit's spinner, which fails there with NoSessionContext.
+
+def test_enrichment_ledger_created_off_the_loop():
+    at = run_search()
+    get_enrichment_ledger.clear()
+
+    next(b for b in at.button if b.label.startswith("📨 Enrich all on this page")).click().run()
+
+    assert not at.exception
+    assert at.session_state["selected_contacts"]
+
+
+def _search_script():
+    import streamlit as st
+
+    from enrichment.apollo_search import get_search_cache, iter_search_domains
+
+    get_search_cache.clear()
+    # Coroutines submitted from the script thread inherit its container context
+    with st.container():
+        st.session_state["found"] = sum(len(people) for _, people, _ in iter_search_domains(["a.com", "b.com"], ["London"]))
+
+
+def test_search_cache_created_off_the_loop():
+    at = AppTest.from_function(_search_script, default_timeout=30).run()
+
+    assert not at.exception
+    assert at.session_state["found"] == 10
+
+def _collect_script():
+    import streamlit as st
+
+    from core.company_profile_cache import get_company_profile_cache
+    from core.company_store import get_company_store
+    from core.coresignal_collect import collect_companies
+
+    get_company_profile_cache.clear()
+    get_company_store.clear()
+    with st.container():
+        st.session_state["profiles"] = collect_companies(["1", "2"])
+
+
+def test_company_caches_created_off_the_loop():
+    at = AppTest.from_function(_collect_script, default_timeout=30).run()
+
+    assert not at.exception
+    assert set(at.session_state["profiles"]) == {"1", "2"}
+
+
+if __name__ == "__main__":
+    test_enrichment_ledger_created_off_the_loop()
+    test_search_cache_created_off_the_loop()
+    test_company_caches_created_off_the_loop()
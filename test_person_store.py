@@ -0,0 +1,17 @@
+import gc
+import os
+
+from enrichment.person_store import PersonStore
+
+
+def test_raw_file_goes_away_with_the_store():
+    store = PersonStore(keep_raw=True)
+    store.extend([{"id": "p1", "name": "Ada"}], searched_company="a.com")
+    path = store.raw_path
+
+    assert store.raw("p1") == {"id": "p1", "name": "Ada"}
+    assert os.path.exists(path)
+
+    del store
+    gc.collect()
+    assert not os.path.exists(path)
@@ -1,5 +1,4 @@
-
-from core.filters import parse_user_query_to_filters
+from core.filters import parse_query_rules, parse_user_query_to_filters
 from utils.env_loader import load_environment
 
 def test_query_to_filters():
@@ -9,9 +8,37 @@ def test_query_to_filters():
 
     filters = parse_user_query_to_filters(user_query)
 
-    print("🧪 Parsed Filters:\n")
-    for key, value in filters.items():
-        print(f"{key}: {value}")
+    assert filters == {
+        "max_results": 50,
+        "industry": "Technology, Information and Internet",
+        "location": "London",
+        "employees_count_gte": 1001,
+    }
+
+def test_rules_country_aliases():
+    assert parse_query_rules("20 fintech companies in the UK") == ({"max_results": 20, "industry": "Financial Services", "country": "United Kingdom"}, True)
+    assert parse_query_rules("banks in the USA") == ({"industry": "Banking", "country": "United States"}, True)
+    assert parse_query_rules("10 software companies in the US") == ({"max_results": 10, "industry": "Software Development", "country": "United States"}, True)
+    assert parse_query_rules("software companies in the U.S.") == ({"industry": "Software Development", "country": "United States"}, True)
+
+def test_rules_us_pronoun_is_not_a_country():
+    filters, complete = parse_query_rules("Give us 10 software companies in Paris")
+
+    assert "country" not in filters
+    assert filters["location"] == "Paris"
+    # "us" is left for the LLM to read rather than guessed
+    assert not complete
+
+def test_rules_employee_sizes():
+    assert parse_query_rules("saas companies with at least 500 employees")[0]["employees_count_gte"] == 500
+    assert parse_query_rules("retail companies with 5k+ employees")[0]["employees_count_gte"] == 5000
+
+def test_rules_unknown_words_are_incomplete():
+    assert parse_query_rules("companies that sell artisanal cheese")[1] is False
 
 if __name__ == "__main__":
-    test_query_to_filters()
\ No newline at end of file
+    test_query_to_filters()
+    test_rules_country_aliases()
+    test_rules_us_pronoun_is_not_a_country()
+    test_rules_employee_sizes()
+    test_rules_unknown_words_are_incomplete()
@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from utils.rate_limiter import QUOTA_PROBE_INTERVAL, AdaptiveRateLimiter, QuotaExhausted
+
+
+class Response:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+DAY_USED_UP = {"x-rate-limit-24-hour": "1000", "x-24-hour-requests-left": "0"}
+
+
+def test_used_up_day_without_reset_is_rechecked_soon():
+    limiter = AdaptiveRateLimiter()
+    limiter.call("apollo.people_match", lambda: Response(headers=DAY_USED_UP))
+
+    with pytest.raises(QuotaExhausted) as exhausted:
+        limiter.call("apollo.people_match", Response)
+    assert exhausted.value.retry_at <= time.time() + QUOTA_PROBE_INTERVAL
+
+
+def test_provider_reset_time_is_used():
+    limiter = AdaptiveRateLimiter()
+    limiter.call("apollo.people_match", lambda: Response(headers={**DAY_USED_UP, "x-ratelimit-reset": "7200"}))
+
+    with pytest.raises(QuotaExhausted) as exhausted:
+        limiter.call("apollo.people_match", Response)
+    assert exhausted.value.retry_at == pytest.approx(time.time() + 7200, abs=5)
+
+
+def test_one_probe_clears_the_quota():
+    limiter = AdaptiveRateLimiter()
+    limiter.call("apollo.people_match", lambda: Response(headers=DAY_USED_UP))
+    bucket = limiter.bucket("apollo.people_match")
+    bucket.exhausted_until = time.time() - 1  # Re-check is due
+
+    def probe():
+        # While the probe is in flight, other callers still fail fast
+        with pytest.raises(QuotaExhausted):
+            limiter.acquire("apollo.people_match")
+        return Response(headers={"x-rate-limit-24-hour": "1000", "x-24-hour-requests-left": "500"})
+    limiter.call("apollo.people_match", probe)
+
+    assert limiter.call("apollo.people_match", Response).status_code == 200
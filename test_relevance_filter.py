@@ -0,0 +1,77 @@
+import time
+
+from streamlit.testing.v1 import AppTest
+
+from enrichment.relevance_scoring import criteria_hash
+
+
+def run_search(domains=("a.com", "b.com", "c.com")) -> AppTest:
+    """Runs the app's search against the mock Apollo server (see conftest.py) until it finishes."""
+    at = AppTest.from_file("app.py", default_timeout=30)
+    at.run()
+    at.text_area[0].input("\n".join(domains))
+    at.run()
+    at.checkbox[0].check()
+    at.text_input[0].input("London")
+    at.run()
+    next(b for b in at.button if b.label == "Start Search").click()
+    at.run()
+    run = at.session_state["search_run"]
+    deadline = time.time() + 20
+    while run.running and time.time() < deadline:
+        time.sleep(0.1)
+    at.run()
+    assert not run.running and not run.error
+    return at
+
+
+def set_scores(at: AppTest, score_for):
+    run = at.session_state["search_run"]
+    at.session_state["relevance"] = {
+        "criteria": criteria_hash(run.job_titles, run.seniorities),
+        "scores": {r.id: score_for(i) for i, r in enumerate(run.results.records())},
+    }
+    at.run()
+
+
+def test_threshold_above_every_score():
+    at = run_search()
+    set_scores(at, lambda i: 10)
+
+    at.slider(key="min_relevance").set_value(50).run()
+
+    assert not at.exception
+    assert any("No contacts above this relevance threshold" in i.value for i in at.info)
+
+
+def test_threshold_change_resets_page():
+    at = run_search()
+    set_scores(at, lambda i: 90 if i % 2 else 10)
+    next(b for b in at.button if b.label == "Next ➡️").click().run()
+    assert at.session_state.current_page == 2
+
+    at.slider(key="min_relevance").set_value(50).run()
+
+    assert not at.exception
+    assert at.session_state.current_page == 1
+
+
+def test_select_follows_the_person_when_rows_move():
+    at = run_search()
+    set_scores(at, lambda i: 100 - i)
+    at.selectbox(key="results_sort").set_value("Relevance").run()
+    clicked = at.session_state["search_run"].results.records()[0].id  # Top of the page
+
+    # New scores land before the click is handled: the last person jumps to
+    # the top, moving everyone else down a row
+    at.button(key=f"select_{clicked}").click()
+    set_scores(at, lambda i: 101 if i == 14 else 100 - i)
+
+    assert not at.exception
+    assert at.session_state["selected_contacts"].ids() == [clicked]
+
+
+if __name__ == "__main__":
+    test_threshold_above_every_score()
+    test_threshold_change_resets_page()
+    test_select_follows_the_person_when_rows_move()
@@ -0,0 +1,34 @@
+import threading
+import time
+
+from enrichment.search_run import SearchRun
+from utils.jobs import DONE, RUNNING, Job, JobManager
+
+
+class Blocker(Job):
+    kind = "blocker"
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def run(self):
+        self.release.wait(30)
+
+
+def test_searches_do_not_queue_behind_job_workers():
+    jobs = JobManager(workers=1)
+    blocker = jobs.submit(Blocker())
+    try:
+        runs = [jobs.submit(SearchRun([f"run{i}.com"], "London", use_cache=False)) for i in range(3)]
+
+        deadline = time.time() + 20
+        while any(run.running for run in runs) and time.time() < deadline:
+            time.sleep(0.05)
+
+        # The only worker is still busy, yet every search has run on the client loop
+        assert blocker.status == RUNNING
+        assert [run.status for run in runs] == [DONE] * 3
+        assert [run.total_found for run in runs] == [5] * 3
+    finally:
+        blocker.release.set()
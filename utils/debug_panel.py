@@ -0,0 +1,73 @@
+# utils/debug_panel.py
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from utils.logger import get_metrics
+from utils.tracing import get_tracer
+
+
+def debug_enabled() -> bool:
+    """The panel is hidden unless the page is opened with ?debug=1."""
+    return st.query_params.get("debug") == "1"
+
+
+def waterfall_frame(spans) -> pd.DataFrame:
+    """One row per span with its start/end offsets (ms) from the start of the trace."""
+    if not spans:
+        return pd.DataFrame(columns=["stage", "start_ms", "end_ms", "duration_ms", "depth"])
+    origin = min(s.start for s in spans)
+    by_id = {s.span_id: s for s in spans}
+    rows = []
+    for i, s in enumerate(spans):
+        depth = 0
+        parent = by_id.get(s.parent_id)
+        while parent is not None:
+            depth += 1
+            parent = by_id.get(parent.parent_id)
+        rows.append({
+            "stage": f"{i:03d} {'  ' * depth}{s.name}",
+            "start_ms": round((s.start - origin) * 1000, 2),
+            "end_ms": round((s.start - origin + (s.duration or 0)) * 1000, 2),
+            "duration_ms": round((s.duration or 0) * 1000, 2),
+            "depth": depth,
+        })
+    return pd.DataFrame(rows)
+
+
+def render_debug_panel(root_name: str | None = None):
+    """Waterfall of the last finished trace, p50/p95 per stage, metrics and a trace dump."""
+    tracer = get_tracer()
+    with st.expander("🛠️ Debug: timings", expanded=True):
+        spans = tracer.last_trace(root_name)
+        st.write(f"**Last {root_name or 'trace'}** – {len(spans)} spans")
+        df = waterfall_frame(spans)
+        if not df.empty:
+            chart = alt.Chart(df).mark_bar().encode(
+                x=alt.X("start_ms:Q", title="ms"),
+                x2="end_ms:Q",
+                y=alt.Y("stage:N", sort=None, title=None),
+                color=alt.Color("depth:O", legend=None),
+                tooltip=["stage", "start_ms", "duration_ms"]
+            ).properties(height=min(600, 22 * len(df) + 40))
+            st.altair_chart(chart, use_container_width=True)
+
+        stats = tracer.stage_stats()
+        if stats:
+            st.write("**Per stage (recent calls, ms)**")
+            st.dataframe(pd.DataFrame([
+                {"stage": name, "count": s["count"], "p50": round(s["p50"] * 1000, 2),
+                 "p95": round(s["p95"] * 1000, 2), "max": round(s["max"] * 1000, 2)}
+                for name, s in stats.items()
+            ]), use_container_width=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("💾 Dump traces to file"):
+                st.success(f"Traces appended to {tracer.dump()}")
+        with col2:
+            st.download_button("📈 Metrics (Prometheus)", get_metrics().to_prometheus(),
+                               file_name="metrics.prom", mime="text/plain")
+        with st.expander("Metrics (JSON)"):
+            st.json(get_metrics().snapshot())
@@ -0,0 +1,142 @@
+# utils/http_client.py
+
+import asyncio
+import importlib.util
+import threading
+from urllib.parse import urljoin
+
+import httpx
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+from config import (
+    APOLLO_API_KEY, APOLLO_BASE_URL,
+    CORESIGNAL_API_KEY, CORESIGNAL_BASE_URL,
+    HUBSPOT_API_KEY, HUBSPOT_BASE_URL,
+    HTTP_POOL_SIZE, HTTP_TIMEOUT
+)
+
+# HTTP/2 is only switched on when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+COMMON_HEADERS = {
+    "accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Content-Type": "application/json",
+}
+
+
+def provider_settings() -> dict:
+    """Base URL and default headers for every provider we talk to."""
+    return {
+        "apollo": {
+            "base_url": APOLLO_BASE_URL,
+            "headers": {"Cache-Control": "no-cache", "x-api-key": APOLLO_API_KEY or ""},
+        },
+        "coresignal": {
+            "base_url": CORESIGNAL_BASE_URL,
+            "headers": {"apikey": CORESIGNAL_API_KEY or ""},
+        },
+        "hubspot": {
+            "base_url": HUBSPOT_BASE_URL,
+            "headers": {"authorization": f"Bearer {HUBSPOT_API_KEY or ''}"},
+        },
+    }
+
+
+class ProviderSession(requests.Session):
+    """
+    requests.Session bound to one provider: keep-alive pool, default headers,
+    default timeout and paths resolved against the provider's base URL.
+    """
+
+    def __init__(self, base_url: str, headers: dict, timeout: float = HTTP_TIMEOUT, pool_size: int = HTTP_POOL_SIZE):
+        super().__init__()
+        self.base_url = base_url
+        self.timeout = timeout
+        self.headers.update(COMMON_HEADERS)
+        self.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, urljoin(self.base_url, url), *args, **kwargs)
+
+
+class ApiClients:
+    """
+    Connection pools shared by every module in the server process.
+
+    Blocking code uses `session(provider)`. Async code runs on a single event
+    loop owned by this object (in a daemon thread) so the httpx pools returned
+    by `async_client(provider)` are reused across calls instead of being tied
+    to a throwaway loop; `run()` and `stream()` bridge into it from sync code.
+    """
+
+    def __init__(self):
+        self.settings = provider_settings()
+        self._sessions = {}
+        self._async_clients = {}
+        self._lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="api-clients-loop", daemon=True)
+        self._thread.start()
+
+    def session(self, provider: str) -> ProviderSession:
+        with self._lock:
+            if provider not in self._sessions:
+                conf = self.settings[provider]
+                self._sessions[provider] = ProviderSession(conf["base_url"], conf["headers"])
+            return self._sessions[provider]
+
+    def async_client(self, provider: str) -> httpx.AsyncClient:
+        """Must be called from a coroutine running on `self.loop`."""
+        if provider not in self._async_clients:
+            conf = self.settings[provider]
+            self._async_clients[provider] = httpx.AsyncClient(
+                base_url=conf["base_url"],
+                headers={**COMMON_HEADERS, **conf["headers"]},
+                timeout=HTTP_TIMEOUT,
+                limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE),
+                http2=HTTP2_AVAILABLE
+            )
+        return self._async_clients[provider]
+
+    def run(self, coro):
+        """Runs a coroutine on the shared loop and blocks until it is done."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stream(self, agen):
+        """Iterates an async generator from sync code, item by item."""
+        pending = None
+
+        async def next_item():
+            nonlocal pending
+            pending = asyncio.ensure_future(agen.__anext__())
+            return await pending
+
+        async def close():
+            # Left mid-item (e.g. Ctrl-C while waiting): the generator is still
+            # running on the loop and must be stopped before it can be closed
+            if pending is not None and not pending.done():
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
+            await agen.aclose()
+
+        try:
+            while True:
+                try:
+                    yield self.run(next_item())
+                except StopAsyncIteration:
+                    break
+        finally:
+            self.run(close())
+
+
+@st.cache_resource
+def get_clients() -> ApiClients:
+    """One ApiClients per server process, shared by every Streamlit session."""
+    return ApiClients()
@@ -0,0 +1,179 @@
+# utils/jobs.py
+
+import abc
+import asyncio
+import contextlib
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import streamlit as st
+
+from config import JOB_TTL, JOB_WORKERS, MAX_JOBS
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class Job(abc.ABC):
+    """
+    A unit of work run by the JobManager's worker threads, outside any
+    Streamlit script run. Subclasses implement run(), report progress through
+    `progress`/`total` and check `cancelled` (or override cancel()) to stop
+    early. What run() returns ends up in `result`; an exception in `error`.
+    """
+
+    kind = "job"
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:12]
+        self.status = PENDING
+        self.progress = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    @abc.abstractmethod
+    def run(self):
+        """Does the work; runs on a JobManager worker thread."""
+
+    @property
+    def running(self) -> bool:
+        return self.status in (PENDING, RUNNING)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.status == PENDING:
+            # Still queued: it will never start
+            self.status = CANCELLED
+            self.finished_at = time.time()
+
+    def execute(self):
+        """Called by the worker thread: runs the job and records how it ended."""
+        if self.cancelled:
+            return
+        with self._recording():
+            self.result = self.run()
+
+    @contextlib.contextmanager
+    def _recording(self):
+        self.started_at = time.time()
+        self.status = RUNNING
+        try:
+            yield
+            self.status = CANCELLED if self.cancelled else DONE
+        except (CancelledError, asyncio.CancelledError):
+            self.status = CANCELLED
+        except Exception as e:
+            log.exception("❌ %s job %s failed: %s", self.kind, self.id, e)
+            self.error = e
+            self.status = FAILED
+        finally:
+            self.finished_at = time.time()
+            log.info("🏁 %s job %s %s in %.1fs", self.kind, self.id, self.status, self.finished_at - self.started_at)
+
+
+class AsyncJob(Job):
+    """
+    A job that is mostly waiting on I/O: it runs as a coroutine on `loop`
+    (e.g. the shared client loop) instead of holding a worker thread, so it
+    never queues behind other jobs. Subclasses implement run_async().
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self.loop = loop
+        self._future = None
+
+    @abc.abstractmethod
+    async def run_async(self):
+        """Does the work; runs on `loop`."""
+
+    def run(self):
+        return asyncio.run_coroutine_threadsafe(self.run_async(), self.loop).result()
+
+    def start(self):
+        """Schedules the job on its loop and returns at once."""
+        self._future = asyncio.run_coroutine_threadsafe(self._execute_async(), self.loop)
+
+    def cancel(self):
+        super().cancel()
+        if self._future is not None:
+            self._future.cancel()
+
+    async def _execute_async(self):
+        if self.cancelled:
+            return
+        with self._recording():
+            self.result = await self.run_async()
+
+
+class JobManager:
+    """
+    Runs jobs on a small thread pool (AsyncJobs on their own loop) and keeps
+    them by id, so any session (e.g. a reopened tab holding the id in its
+    URL) can find a job again.
+    Finished jobs are forgotten after `ttl` seconds, oldest first beyond
+    `max_jobs`.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, ttl: float = JOB_TTL, max_jobs: int = MAX_JOBS):
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+
+    def submit(self, job: Job) -> Job:
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        if isinstance(job, AsyncJob):
+            job.start()
+        else:
+            self._pool.submit(job.execute)
+        log.info("📋 %s job %s submitted", job.kind, job.id)
+        return job
+
+    def get(self, job_id: str | None) -> Job | None:
+        if not job_id:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, kind: str | None = None) -> list[Job]:
+        """Known jobs, newest first."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return sorted((j for j in jobs if kind is None or j.kind == kind), key=lambda j: -j.created_at)
+
+    def _prune(self):
+        now = time.time()
+        finished = [j for j in self._jobs.values() if not j.running]
+        for job in finished:
+            if now - job.finished_at > self.ttl:
+                del self._jobs[job.id]
+        excess = len(self._jobs) - self.max_jobs + 1
+        for job in sorted((j for j in finished if j.id in self._jobs), key=lambda j: j.finished_at)[:max(0, excess)]:
+            del self._jobs[job.id]
+
+
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """Job registry shared by every session in the server process."""
+    return JobManager()
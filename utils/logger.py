@@ -0,0 +1,207 @@
+# utils/logger.py
+
+import bisect
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from config import LOG_FORMAT, LOG_LEVEL, LOG_SAMPLE_RATE
+
+ROOT_LOGGER = "ai_agent"
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sample"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the `extra` fields as top-level keys."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drops a share of the records logged with extra={"sample": rate}, so
+    per-request lines stay affordable under concurrency. sample=True uses
+    LOG_SAMPLE_RATE.
+    """
+
+    def filter(self, record):
+        rate = getattr(record, "sample", None)
+        if rate is None:
+            return True
+        if rate is True:
+            rate = LOG_SAMPLE_RATE
+        return random.random() < rate
+
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def _configure():
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        root = logging.getLogger(ROOT_LOGGER)
+        handler = logging.StreamHandler(sys.stdout)
+        if LOG_FORMAT == "json":
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        handler.addFilter(SamplingFilter())
+        root.addHandler(handler)
+        root.setLevel(LOG_LEVEL)
+        root.propagate = False
+        _configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the app's root logger, e.g. get_logger(__name__)."""
+    _configure()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class Metrics:
+    """
+    In-process counters and latency histograms, labelled by endpoint (or
+    cache name). Thread-safe; exported as JSON or Prometheus text.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = defaultdict(int)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _labels(labels: dict) -> tuple:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, metric: str, n: int = 1, **labels):
+        with self._lock:
+            self._counters[(metric, self._labels(labels))] += n
+
+    def observe(self, metric: str, seconds: float, **labels):
+        key = (metric, self._labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            histogram["counts"][bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+
+    @contextmanager
+    def timed(self, metric: str, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, time.perf_counter() - started, **labels)
+
+    def counter(self, metric: str, **labels) -> int:
+        with self._lock:
+            return self._counters.get((metric, self._labels(labels)), 0)
+
+    def _quantile(self, histogram: dict, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (inf for the overflow bucket)."""
+        if not histogram["count"]:
+            return None
+        rank = q * histogram["count"]
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), histogram["counts"]):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: {"counts": list(v["counts"]), "sum": v["sum"], "count": v["count"]} for k, v in self._histograms.items()}
+
+        out = {"counters": defaultdict(dict), "histograms": defaultdict(dict)}
+        for (metric, labels), value in sorted(counters.items()):
+            out["counters"][metric][_label_text(labels)] = value
+        for (metric, labels), histogram in sorted(histograms.items()):
+            out["histograms"][metric][_label_text(labels)] = {
+                "count": histogram["count"],
+                "sum": round(histogram["sum"], 6),
+                "p50": self._quantile(histogram, 0.5),
+                "p95": self._quantile(histogram, 0.95),
+                "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], histogram["counts"])),
+            }
+        return {"counters": dict(out["counters"]), "histograms": dict(out["histograms"])}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, default=str)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (cumulative histogram buckets)."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((k, {"counts": list(v["counts"]), "sum": v["sum"], "count": v["count"]}) for k, v in self._histograms.items())
+
+        lines = []
+        typed = set()
+        for (metric, labels), value in counters:
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{_prom_labels(labels)} {value}")
+        for (metric, labels), histogram in histograms:
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            cumulative = 0
+            for bound, count in zip([str(b) for b in self.buckets] + ["+Inf"], histogram["counts"]):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_prom_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{metric}_sum{_prom_labels(labels)} {histogram['sum']:.6f}")
+            lines.append(f"{metric}_count{_prom_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _label_text(labels: tuple) -> str:
+    return ",".join(f"{k}={v}" for k, v in labels) or "all"
+
+
+def _prom_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    escaped = (k + '="' + str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"' for k, v in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Process-wide metrics registry shared by every API client."""
+    return _metrics
@@ -0,0 +1,171 @@
+# utils/openai_batch.py
+
+import asyncio
+import json
+import os
+import time
+import uuid
+
+import openai
+
+from config import CACHE_DIR, OPENAI_API_KEY
+from utils.http_client import get_clients
+from utils.logger import get_logger
+from utils.openai_utils import DEFAULT_MODEL, get_openai_client, parse_json_content
+
+log = get_logger(__name__)
+
+BATCH_DIR = os.path.join(CACHE_DIR, "openai_batches")
+CHAT_ENDPOINT = "/v1/chat/completions"
+FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+OPENAI_CONCURRENCY = 8
+
+_async_client = None
+
+
+def get_async_openai_client() -> openai.AsyncOpenAI:
+    """AsyncOpenAI client bound to the shared loop; only call it from coroutines running there."""
+    global _async_client
+    if _async_client is None:
+        _async_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _async_client
+
+
+def _chat_body(prompt: str, model: str) -> dict:
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0
+    }
+
+
+def _parse_content(content: str, parse_json: bool):
+    return parse_json_content(content) if parse_json else content.strip()
+
+
+# --- Batch API: offline, half price, results within the completion window
+
+def write_batch_file(prompts: dict, model: str = DEFAULT_MODEL, path: str | None = None) -> str:
+    """Writes {custom_id: prompt} as a Batch API input file and returns its path."""
+    if path is None:
+        os.makedirs(BATCH_DIR, exist_ok=True)
+        path = os.path.join(BATCH_DIR, f"batch_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for custom_id, prompt in prompts.items():
+            line = {"custom_id": str(custom_id), "method": "POST", "url": CHAT_ENDPOINT, "body": _chat_body(prompt, model)}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    log.info("📝 Wrote %d batch requests to %s", len(prompts), path)
+    return path
+
+
+def submit_batch(path: str, client=None, completion_window: str = "24h", metadata: dict | None = None):
+    """Uploads a batch input file and creates the batch; returns the Batch object."""
+    client = client or get_openai_client()
+    with open(path, "rb") as f:
+        input_file = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=CHAT_ENDPOINT,
+        completion_window=completion_window,
+        metadata=metadata
+    )
+    log.info("🚀 Submitted batch %s (%s)", batch.id, os.path.basename(path))
+    return batch
+
+
+def wait_for_batch(batch_id: str, client=None, poll_interval: float = 30, timeout: float | None = None):
+    """Polls a batch until it reaches a final status; returns the Batch object."""
+    client = client or get_openai_client()
+    deadline = time.time() + timeout if timeout else None
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        if counts is not None:
+            log.info("⏳ Batch %s: %s (%d/%d done, %d failed)", batch_id, batch.status, counts.completed, counts.total, counts.failed)
+        if batch.status in FINAL_STATUSES:
+            return batch
+        if deadline and time.time() >= deadline:
+            raise TimeoutError(f"Batch {batch_id} still {batch.status} after {timeout}s")
+        time.sleep(poll_interval)
+
+
+def _read_jsonl(client, file_id: str) -> list[dict]:
+    if not file_id:
+        return []
+    text = client.files.content(file_id).text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def download_batch_results(batch, client=None, parse_json: bool = True) -> tuple[dict, dict]:
+    """
+    Reads a finished batch's output and error files. Returns (results, errors):
+    {custom_id: parsed answer} and {custom_id: error message}.
+    """
+    client = client or get_openai_client()
+    results = {}
+    errors = {}
+    for line in _read_jsonl(client, batch.output_file_id) + _read_jsonl(client, batch.error_file_id):
+        custom_id = line.get("custom_id")
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or (response.get("body") or {}).get("error") or {}
+            errors[custom_id] = error.get("message") or f"HTTP {response.get('status_code')}"
+            continue
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+            results[custom_id] = _parse_content(content, parse_json)
+        except (KeyError, IndexError, ValueError) as e:
+            errors[custom_id] = str(e)
+    return results, errors
+
+
+def run_batch(prompts: dict, model: str = DEFAULT_MODEL, client=None, poll_interval: float = 30, timeout: float | None = None, parse_json: bool = True) -> tuple[dict, dict]:
+    """
+    Whole Batch API round trip for {custom_id: prompt}: write the JSONL,
+    submit, poll until done and merge the answers back by custom_id.
+    Prompts missing from both outputs are reported as errors.
+    """
+    client = client or get_openai_client()
+    path = write_batch_file(prompts, model)
+    batch = submit_batch(path, client)
+    batch = wait_for_batch(batch.id, client, poll_interval, timeout)
+    if batch.status != "completed":
+        log.error("❌ Batch %s ended as %s", batch.id, batch.status)
+    results, errors = download_batch_results(batch, client, parse_json)
+    for custom_id in prompts:
+        custom_id = str(custom_id)
+        if custom_id not in results and custom_id not in errors:
+            errors[custom_id] = f"No result (batch {batch.status})"
+    log.info("✅ Batch %s: %d results, %d errors", batch.id, len(results), len(errors))
+    return results, errors
+
+
+# --- Concurrent mode: regular chat calls, answers in seconds
+
+async def complete_prompts_async(prompts: dict, model: str = DEFAULT_MODEL, concurrency: int = OPENAI_CONCURRENCY, client=None, parse_json: bool = True) -> tuple[dict, dict]:
+    """Sends {custom_id: prompt} as chat calls with at most `concurrency` in flight."""
+    client = client or get_async_openai_client()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(custom_id, prompt):
+        async with semaphore:
+            try:
+                response = await client.chat.completions.create(**_chat_body(prompt, model))
+                return custom_id, _parse_content(response.choices[0].message.content, parse_json), None
+            except Exception as e:
+                log.warning("❌ OpenAI call failed for %s: %s", custom_id, e)
+                return custom_id, None, str(e)
+
+    results = {}
+    errors = {}
+    for custom_id, result, error in await asyncio.gather(*(run_one(str(c), p) for c, p in prompts.items())):
+        if error is None:
+            results[custom_id] = result
+        else:
+            errors[custom_id] = error
+    return results, errors
+
+
+def complete_prompts(prompts: dict, model: str = DEFAULT_MODEL, concurrency: int = OPENAI_CONCURRENCY, client=None, parse_json: bool = True) -> tuple[dict, dict]:
+    """Blocking wrapper around complete_prompts_async, run on the shared client loop."""
+    return get_clients().run(complete_prompts_async(prompts, model, concurrency, client, parse_json))
@@ -5,18 +5,35 @@ import json
 from config import OPENAI_API_KEY
 import re
 
-client = openai.OpenAI(api_key=OPENAI_API_KEY)
+DEFAULT_MODEL = "gpt-4-1106-preview"
 
-def call_openai_chat_completion(prompt: str, model: str = "gpt-4-1106-preview") -> dict:
-    response = client.chat.completions.create(
-        model=model,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0
-    )
-    content = response.choices[0].message.content.strip()
+_client = None
+
+
+def get_openai_client() -> openai.OpenAI:
+    """OpenAI client, created on first use so importing this module never needs a key."""
+    global _client
+    if _client is None:
+        _client = openai.OpenAI(api_key=OPENAI_API_KEY)
+    return _client
+
+
+def parse_json_content(content: str) -> dict:
+    """Parses a model answer as JSON, tolerating ```json fences around it."""
+    content = content.strip()
     content = re.sub(r"^```(?:json)?\s*", "", content)
     content = re.sub(r"\s*```$", "", content)
 
     try:
         return json.loads(content)
-    e
\ No newline at end of file
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Model did not return valid JSON: {content[:200]}") from e
+
+
+def call_openai_chat_completion(prompt: str, model: str = DEFAULT_MODEL) -> dict:
+    response = get_openai_client().chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0
+    )
+    return parse_json_content(response.choices[0].message.content)
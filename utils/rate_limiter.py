@@ -0,0 +1,284 @@
+# utils/rate_limiter.py
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from utils.logger import get_logger, get_metrics
+
+log = get_logger(__name__)
+
+# Starting budgets (requests per minute) for each endpoint. They are only a
+# starting point: the limiter tightens or relaxes them from the rate-limit
+# headers and 429 responses the providers send back.
+DEFAULT_LIMITS_PER_MINUTE = {
+    "apollo.mixed_people_search": 100,
+    "apollo.people_match": 100,
+    "apollo.people_bulk_match": 50,
+    "coresignal.search": 60,
+    "coresignal.collect": 60,
+    "hubspot.contacts_batch": 300,
+}
+FALLBACK_LIMIT_PER_MINUTE = 60
+
+# Minimum rate we back off to, whatever the provider says
+MIN_RATE_PER_SECOND = 0.1
+# Number of times a 429 response is retried before giving up
+MAX_429_RETRIES = 3
+# An hourly/daily quota used up with no reset time given (Apollo sends none)
+# is re-checked by a single request after this many seconds
+QUOTA_PROBE_INTERVAL = 300
+
+# Header pairs (limit, remaining, window in seconds) that providers use to
+# describe their budgets. Apollo sends per-minute/hour/day counters, other
+# providers the generic X-RateLimit-* family.
+_WINDOW_HEADERS = [
+    ("x-rate-limit-minute", "x-minute-requests-left", 60),
+    ("x-rate-limit-hourly", "x-hourly-requests-left", 3600),
+    ("x-rate-limit-24-hour", "x-24-hour-requests-left", 86400),
+    ("x-ratelimit-limit", "x-ratelimit-remaining", 60),
+]
+
+
+class QuotaExhausted(Exception):
+    """
+    Raised instead of waiting when an endpoint used up an hourly or daily
+    quota: sleeping until it resets would look like a hang. `retry_at` is the
+    time (epoch seconds) of the provider's reset, or of the next re-check.
+    """
+
+    def __init__(self, endpoint: str, retry_at: float):
+        self.endpoint = endpoint
+        self.retry_at = retry_at
+        super().__init__(f"{endpoint} quota exhausted; try again after {time.strftime('%Y-%m-%d %H:%M', time.localtime(retry_at))}")
+
+
+def parse_retry_after(value) -> float | None:
+    """Retry-After is either a number of seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Callers reserve a token and get back how long
+    they must wait before using it, so the same bucket serves both blocking
+    and asyncio code.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.ceiling = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        # Wall-clock time an exhausted hourly/daily quota comes back
+        self.exhausted_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.blocked_until - now)
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(MIN_RATE_PER_SECOND, rate)
+            self.capacity = max(1.0, self.rate)
+
+    def block_for(self, seconds: float):
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def check_quota(self) -> float | None:
+        """
+        None when calls may go ahead, else the time the exhausted quota is
+        re-checked. Once that time has passed, one caller goes ahead to
+        re-check it while the others keep failing until its response clears
+        the quota (or another QUOTA_PROBE_INTERVAL passes).
+        """
+        with self._lock:
+            now = time.time()
+            if not self.exhausted_until:
+                return None
+            if now < self.exhausted_until:
+                return self.exhausted_until
+            self.exhausted_until = now + QUOTA_PROBE_INTERVAL
+            return None
+
+
+class AdaptiveRateLimiter:
+    """
+    One token bucket per endpoint. Rates follow the provider's own signals:
+    rate-limit headers set the ceiling, a 429 halves the rate and pauses the
+    endpoint for Retry-After, and every success creeps back towards the ceiling.
+    A used-up per-minute budget pauses the endpoint too; a used-up hourly or
+    daily one makes its calls raise QuotaExhausted until it resets, or until a
+    single re-check request finds it back.
+    """
+
+    def __init__(self, limits_per_minute: dict | None = None):
+        self.limits_per_minute = dict(DEFAULT_LIMITS_PER_MINUTE)
+        self.limits_per_minute.update(limits_per_minute or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        with self._lock:
+            if endpoint not in self._buckets:
+                per_minute = self.limits_per_minute.get(endpoint, FALLBACK_LIMIT_PER_MINUTE)
+                self._buckets[endpoint] = TokenBucket(per_minute / 60.0)
+            return self._buckets[endpoint]
+
+    def reset(self):
+        """Forgets the budgets learned so far; endpoints start again from limits_per_minute."""
+        with self._lock:
+            self._buckets.clear()
+
+    def _reserve(self, endpoint: str) -> float:
+        bucket = self.bucket(endpoint)
+        retry_at = bucket.check_quota()
+        if retry_at is not None:
+            raise QuotaExhausted(endpoint, retry_at)
+        return bucket.reserve()
+
+    def acquire(self, endpoint: str):
+        wait = self._reserve(endpoint)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint: str):
+        wait = self._reserve(endpoint)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(self, endpoint: str, status_code: int, headers=None):
+        """Feeds a response status and headers back into the endpoint's budget."""
+        bucket = self.bucket(endpoint)
+        headers = headers or {}
+        exhausted = False
+
+        for limit_header, remaining_header, window in _WINDOW_HEADERS:
+            limit = _header_number(headers, limit_header)
+            remaining = _header_number(headers, remaining_header)
+            # Per-minute limits set the sustained rate; longer windows only
+            # matter once they are used up
+            if limit and window == 60:
+                bucket.ceiling = limit / window
+            if remaining is not None and remaining <= 0:
+                reset = _header_number(headers, "x-ratelimit-reset")
+                if window == 60:
+                    bucket.block_for(reset if reset is not None and reset < window else window)
+                    continue
+                # Without the provider's reset time, re-check soon rather than
+                # shut the endpoint for the whole window
+                retry_in = reset if reset is not None else QUOTA_PROBE_INTERVAL
+                if not bucket.exhausted_until:
+                    log.warning("🚫 %s quota exhausted; retrying in %ds", endpoint, retry_in, extra={"endpoint": endpoint})
+                bucket.exhausted_until = time.time() + retry_in
+                exhausted = True
+        if not exhausted and status_code < 400:
+            bucket.exhausted_until = 0.0
+
+        if status_code == 429:
+            retry_after = parse_retry_after(headers.get("retry-after"))
+            bucket.set_rate(bucket.rate / 2)
+            bucket.block_for(retry_after if retry_after is not None else 1.0 / bucket.rate)
+        elif status_code < 400 and bucket.rate < bucket.ceiling:
+            bucket.set_rate(min(bucket.ceiling, bucket.rate + bucket.ceiling * 0.05))
+        elif bucket.rate > bucket.ceiling:
+            bucket.set_rate(bucket.ceiling)
+
+    def call(self, endpoint: str, send):
+        """
+        Runs `send()` (a function returning a requests/httpx response) under the
+        endpoint's budget, retrying 429 responses after the advertised delay.
+        Every attempt is counted and timed in the metrics registry. Raises
+        QuotaExhausted while the endpoint's hourly or daily quota is used up.
+        """
+        for attempt in range(MAX_429_RETRIES + 1):
+            self.acquire(endpoint)
+            started = time.perf_counter()
+            try:
+                response = send()
+            except Exception:
+                _observe(endpoint, started, None)
+                raise
+            _observe(endpoint, started, response.status_code)
+            self.record(endpoint, response.status_code, response.headers)
+            if response.status_code != 429:
+                break
+            log.warning("⏳ %s rate limited (attempt %d/%d)", endpoint, attempt + 1, MAX_429_RETRIES + 1, extra={"endpoint": endpoint})
+        return response
+
+    async def call_async(self, endpoint: str, send):
+        """Async version of call(); `send()` returns an awaitable response."""
+        for attempt in range(MAX_429_RETRIES + 1):
+            await self.acquire_async(endpoint)
+            started = time.perf_counter()
+            try:
+                response = await send()
+            except Exception:
+                _observe(endpoint, started, None)
+                raise
+            _observe(endpoint, started, response.status_code)
+            self.record(endpoint, response.status_code, response.headers)
+            if response.status_code != 429:
+                break
+            log.warning("⏳ %s rate limited (attempt %d/%d)", endpoint, attempt + 1, MAX_429_RETRIES + 1, extra={"endpoint": endpoint})
+        return response
+
+
+def _observe(endpoint: str, started: float, status_code: int | None):
+    """Records one API attempt: latency, call count, and errors/429s (status None = transport error)."""
+    elapsed = time.perf_counter() - started
+    metrics = get_metrics()
+    metrics.observe("api_request_duration_seconds", elapsed, endpoint=endpoint)
+    metrics.inc("api_calls_total", endpoint=endpoint)
+    if status_code is None or status_code >= 400:
+        metrics.inc("api_errors_total", endpoint=endpoint)
+    if status_code == 429:
+        metrics.inc("api_rate_limited_total", endpoint=endpoint)
+    log.debug("%s -> %s in %.3fs", endpoint, status_code, elapsed,
+              extra={"endpoint": endpoint, "status": status_code, "seconds": round(elapsed, 4), "sample": True})
+
+
+def _header_number(headers, name) -> float | None:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Returns the process-wide limiter shared by every API client."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveRateLimiter()
+        return _limiter
@@ -0,0 +1,184 @@
+# utils/response_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from utils.logger import get_metrics
+
+
+def normalize_params(params) -> list[tuple]:
+    """
+    Order- and case-insensitive form of a query parameter list, so that
+    "London; Paris" and "paris ; london" share a cache entry.
+    """
+    return sorted((str(k).strip(), str(v).strip().lower()) for k, v in params)
+
+
+def cache_key(namespace: str, params) -> str:
+    raw = json.dumps([namespace, normalize_params(params)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for API responses: an in-memory LRU in front of a SQLite
+    file. Values are stored as JSON, so every get() returns a fresh copy that
+    callers are free to mutate.
+
+    Entries expire after `ttl` seconds (or a per-entry ttl). The memory tier
+    holds at most `max_memory_entries` entries and `max_memory_bytes` of JSON,
+    and the disk tier is trimmed back to `max_disk_bytes`, both by
+    least-recent access. Hits and
+    misses are counted in the metrics registry under `name` (by default the
+    file name).
+    """
+
+    # Expired rows are only swept out this often (or when over the size cap);
+    # get() already ignores them in between
+    sweep_interval = 300
+
+    def __init__(self, path: str, ttl: float, max_memory_entries: int = 1000, max_disk_bytes: int = 200 * 1024 * 1024, name: str | None = None,
+                 max_memory_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.name = name or os.path.splitext(os.path.basename(path))[0]
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at)")
+        self._db.commit()
+        # Running total of the stored sizes, so set() never has to sum the table
+        self._size = 0
+        self._next_sweep = 0
+        self._sweep(time.time())
+        self._db.commit()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, raw = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count(True)
+                    return json.loads(raw)
+                self._forget(key)
+
+            row = self._db.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self._count(False)
+                return None
+            raw, expires_at = row
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._remember(key, expires_at, raw)
+            self._count(True)
+            return json.loads(raw)
+
+    def set(self, key: str, value, ttl: float | None = None):
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        raw = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, expires_at, raw)
+            self._size += len(raw) - self._stored_size(key)
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, raw, len(raw), now, expires_at, now)
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._forget(key)
+            self._size -= self._stored_size(key)
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._size = 0
+
+    def _count(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        get_metrics().inc("cache_hits_total" if hit else "cache_misses_total", cache=self.name)
+
+    def _remember(self, key, expires_at, raw):
+        self._forget(key)
+        self._memory[key] = (expires_at, raw)
+        self._memory_bytes += len(raw)
+        while self._memory and (len(self._memory) > self.max_memory_entries or self._memory_bytes > self.max_memory_bytes):
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _forget(self, key):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[1])
+
+    def _stored_size(self, key) -> int:
+        row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _sweep(self, now):
+        """Drops expired rows and re-reads the total, which also picks up writes by other processes."""
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._next_sweep = now + self.sweep_interval
+
+    def _evict(self, now):
+        if self._size <= self.max_disk_bytes and now < self._next_sweep:
+            return
+        self._sweep(now)
+        if self._size <= self.max_disk_bytes:
+            return
+        excess = self._size - self.max_disk_bytes
+        freed = 0
+        stale = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM responses WHERE key = ?", stale)
+        self._size -= freed
+        for (key,) in stale:
+            self._forget(key)
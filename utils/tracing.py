@@ -0,0 +1,207 @@
+# utils/tracing.py
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from contextvars import ContextVar
+
+from config import CACHE_DIR
+
+# Finished traces kept in memory, and spans kept per trace
+MAX_TRACES = 50
+MAX_SPANS_PER_TRACE = 2000
+# Recent durations kept per stage for the p50/p95 figures
+STAGE_WINDOW = 1000
+TRACE_DUMP_PATH = os.path.join(CACHE_DIR, "traces.jsonl")
+
+_current_span = ContextVar("current_span", default=None)
+
+
+class Span:
+    """
+    One timed stage. Spans opened while another span is current become its
+    children and share its trace id; the current span lives in a ContextVar,
+    so it follows asyncio tasks and coroutines submitted to the shared loop.
+    """
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "end", "attrs", "_token")
+
+    def __init__(self, name: str, attrs: dict | None = None, root: bool = False):
+        parent = None if root else _current_span.get()
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.end = None
+        self.attrs = attrs or {}
+        self._token = None
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.end is None else self.end - self.start
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """Keeps the spans of the last MAX_TRACES traces and recent durations per stage."""
+
+    def __init__(self, max_traces: int = MAX_TRACES):
+        self.max_traces = max_traces
+        self._traces = OrderedDict()
+        self._stages = defaultdict(lambda: deque(maxlen=STAGE_WINDOW))
+        self._lock = threading.Lock()
+
+    def start(self, name: str, root: bool = False, **attrs) -> Span:
+        """
+        Opens a span and makes it current; close it with finish(). `root=True`
+        starts a new trace whatever span is current (e.g. a Streamlit rerun,
+        whose previous run may have been interrupted before finishing).
+        """
+        previous = _current_span.get()
+        if root and previous is not None and previous.end is None and previous.parent_id is None and previous.name == name:
+            # The previous run of this root was cut short (st.rerun/st.stop): close it here
+            previous.attrs["interrupted"] = True
+            self.finish(previous)
+        span = Span(name, attrs, root)
+        span._token = _current_span.set(span)
+        return span
+
+    def finish(self, span: Span, error: BaseException | None = None):
+        span.end = time.time()
+        if error is not None:
+            span.attrs["error"] = repr(error)
+        if span._token is not None:
+            try:
+                _current_span.reset(span._token)
+            except ValueError:
+                # Finished from another context (e.g. a different task): nothing to restore
+                pass
+            span._token = None
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+            if len(spans) < MAX_SPANS_PER_TRACE:
+                spans.append(span)
+            self._stages[span.name].append(span.duration)
+
+    def span(self, name: str, root: bool = False, **attrs):
+        return _SpanContext(self, name, root, attrs)
+
+    def traces(self) -> list[list[Span]]:
+        """Recent traces, oldest first; each is its spans sorted by start time."""
+        with self._lock:
+            return [sorted(spans, key=lambda s: s.start) for spans in self._traces.values()]
+
+    def last_trace(self, root_name: str | None = None) -> list[Span]:
+        """Spans of the most recent trace whose root span (optionally named `root_name`) has finished."""
+        for spans in reversed(self.traces()):
+            roots = [s for s in spans if s.parent_id is None]
+            if roots and (root_name is None or roots[0].name == root_name):
+                return spans
+        return []
+
+    def stage_stats(self) -> dict:
+        """{stage: {"count", "p50", "p95", "max"}} in seconds over the recent window."""
+        with self._lock:
+            stages = {name: sorted(d) for name, d in self._stages.items() if d}
+        return {
+            name: {
+                "count": len(durations),
+                "p50": _percentile(durations, 0.5),
+                "p95": _percentile(durations, 0.95),
+                "max": durations[-1],
+            }
+            for name, durations in sorted(stages.items())
+        }
+
+    def dump(self, path: str = TRACE_DUMP_PATH) -> str:
+        """Appends every kept span to a JSONL file for offline analysis; returns the path."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for spans in self.traces():
+                for span in spans:
+                    f.write(json.dumps(span.as_dict(), ensure_ascii=False, default=str) + "\n")
+        return path
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+            self._stages.clear()
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "name", "root", "attrs", "span")
+
+    def __init__(self, tracer, name, root, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.root = root
+        self.attrs = attrs
+        self.span = None
+
+    def __enter__(self) -> Span:
+        self.span = self.tracer.start(self.name, self.root, **self.attrs)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.finish(self.span, exc)
+        return False
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer."""
+    return _tracer
+
+
+def span(name: str, root: bool = False, **attrs):
+    """`with span("stage", key=value):` times a block as a child of the current span."""
+    return _tracer.span(name, root, **attrs)
+
+
+def traced(name: str | None = None):
+    """Decorator timing every call of a function (sync or async) as a span."""
+    def decorate(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _tracer.span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate